@@ -1,6 +1,6 @@
 """
 TherapistIndex — Data Cleaning Pipeline
-Phase 2: Takes raw OutScraper CSV exports and produces cleaned, deduplicated data.
+Phase 2: Takes raw OutScraper CSV/Parquet exports and produces cleaned, deduplicated data.
 
 Usage:
     python scripts/clean_data.py --input data/raw/ --output data/cleaned/
@@ -10,23 +10,33 @@ Usage:
 import argparse
 import re
 import sys
+import threading
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import requests
 
 # Add parent directory to path for utils import
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from utils import (
+    STRING_DTYPE,
+    UNICODE_SPACES,
+    ADDRESS_UPPER_TOKENS,
+    GEODIR_COLUMN_MAP,
+    read_csv_strings,
+    write_table,
     setup_logging,
     load_filter_keywords,
-    standardize_phone,
     standardize_state,
-    standardize_address,
     is_valid_url,
     normalize_url,
-    guess_license_type,
-    is_group_practice,
+    LICENSE_TYPE_KEYWORDS,
+    GROUP_PRACTICE_INDICATORS,
 )
 
 logger = setup_logging("clean_data")
@@ -62,33 +72,111 @@ COLUMN_MAP = {
     "zipcode": "zip_code",
 }
 
+# Raw columns kept from an export (matched after lowercasing and replacing
+# spaces with underscores): OutScraper names, names already in our standard
+# form, and every column prepare_import maps. The rest of a full OutScraper
+# export is skipped at parse time.
+RAW_COLUMNS = (
+    set(COLUMN_MAP) | set(COLUMN_MAP.values()) | set(GEODIR_COLUMN_MAP) | {"photo_url", "description"}
+)
+
+# Low-cardinality text columns, stored as categorical codes plus a small
+# dictionary of distinct values instead of one Python string per cell
+CATEGORICAL_COLUMNS = ["state", "country_code", "category", "status"]
+
+# Concurrent HEAD requests for live URL validation
+URL_CHECK_WORKERS = 32
+
+# One requests.Session per worker thread so keep-alive connections are reused
+_thread_local = threading.local()
+
+# Website cleaning is pure Python per URL; fan out across processes for big frames
+PARALLEL_MIN_ROWS = 100_000
+
+# Address cleanup: whitespace at either end, and commas with surrounding whitespace
+ADDRESS_EDGES = f"^[{UNICODE_SPACES}]+|[{UNICODE_SPACES}]+$"
+ADDRESS_COMMA = f"[{UNICODE_SPACES}]*,[{UNICODE_SPACES}]*"
+
+
+def keyword_pattern(keywords: list[str]) -> re.Pattern | None:
+    """Compile a keyword list into one lowercase alternation for a single-pass str.contains."""
+    escaped = [re.escape(kw.lower()) for kw in keywords if kw]
+    if not escaped:
+        return None
+    return re.compile("|".join(escaped))
+
+
+def contains_any(col: pd.Series, pattern: re.Pattern | None) -> pd.Series:
+    """Boolean mask of cells in an already-lowercased column matching the pattern."""
+    if pattern is None:
+        return pd.Series(False, index=col.index)
+    return col.str.contains(pattern, na=False)
+
+
+def phone_digits(col: pd.Series) -> pd.Series:
+    """Strip everything but digits from a phone column (runs as one Arrow regex kernel)."""
+    return col.fillna("").astype(str).str.replace(r"\D", "", regex=True)
+
+
+def read_raw_csv(path: Path) -> pa.Table:
+    """Read one raw CSV with Arrow's multi-threaded parser, keeping RAW_COLUMNS as strings."""
+    table = read_csv_strings(path, keep=lambda name: name.strip().lower().replace(" ", "_") in RAW_COLUMNS)
+    return table.append_column("_source_file", pa.array([path.name] * table.num_rows, pa.string()))
+
+
+def csv_strings(column: pa.ChunkedArray) -> pa.ChunkedArray:
+    """
+    Format a column as text the way DataFrame.to_csv writes it, nulls kept null.
+    Arrow's own cast differs for floats (-77.0 -> "-77") and bools ("true").
+    """
+    if pa.types.is_floating(column.type) or pa.types.is_boolean(column.type):
+        values = [None if v is None or v != v else str(v) for v in column.to_pylist()]
+        return pa.chunked_array([pa.array(values, pa.string())])
+    return column.cast(pa.string())
+
+
+def read_raw_parquet(path: Path) -> pa.Table:
+    """Read one raw Parquet file from outscraper_pull.py, keeping RAW_COLUMNS as strings."""
+    columns = [
+        name for name in pq.read_schema(path).names
+        if name.strip().lower().replace(" ", "_") in RAW_COLUMNS
+    ]
+    table = pq.read_table(path, columns=columns)
+    # Ratings/coordinates are stored numeric; format them as text so every kept
+    # column matches what the CSV path reads back
+    table = pa.table({name: csv_strings(table[name]) for name in columns})
+    return table.append_column("_source_file", pa.array([path.name] * table.num_rows, pa.string()))
+
 
 def load_raw_csvs(input_path: str) -> pd.DataFrame:
-    """Load one or more raw CSV files from OutScraper."""
+    """Load one or more raw CSV or Parquet files from OutScraper."""
     path = Path(input_path)
-    frames = []
 
-    if path.is_file() and path.suffix == ".csv":
-        logger.info(f"Loading single file: {path}")
-        df = pd.read_csv(path, dtype=str)
-        df["_source_file"] = path.name
-        frames.append(df)
+    if path.is_file() and path.suffix in (".csv", ".parquet"):
+        raw_files = [path]
     elif path.is_dir():
-        csv_files = sorted(path.glob("*.csv"))
-        if not csv_files:
-            logger.error(f"No CSV files found in {path}")
+        raw_files = sorted([*path.glob("*.csv"), *path.glob("*.parquet")])
+        if not raw_files:
+            logger.error(f"No CSV or Parquet files found in {path}")
             sys.exit(1)
-        for csv_file in csv_files:
-            logger.info(f"Loading: {csv_file.name}")
-            df = pd.read_csv(csv_file, dtype=str)
-            df["_source_file"] = csv_file.name
-            frames.append(df)
     else:
         logger.error(f"Input path not found: {input_path}")
         sys.exit(1)
 
-    combined = pd.concat(frames, ignore_index=True)
-    logger.info(f"Loaded {len(combined)} total raw records from {len(frames)} file(s)")
+    tables = []
+    for raw_file in raw_files:
+        logger.info(f"Loading: {raw_file.name}")
+        if raw_file.suffix == ".parquet":
+            tables.append(read_raw_parquet(raw_file))
+        else:
+            tables.append(read_raw_csv(raw_file))
+
+    # Concatenate at the Arrow level (missing columns become nulls) and
+    # convert to pandas once
+    combined = pa.concat_tables(tables, promote_options="default").to_pandas(
+        types_mapper={pa.string(): STRING_DTYPE}.get
+    )
+    logger.info(f"Loaded {len(combined)} total raw records from {len(tables)} file(s)")
     return combined
 
 
@@ -101,9 +189,26 @@ def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
         if old_name in df.columns:
             rename[old_name] = new_name
     df = df.rename(columns=rename)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            values = df[col].fillna("").astype("category")
+            # Later steps call .fillna(""), which needs "" to be a known category
+            if "" not in values.cat.categories:
+                values = values.cat.add_categories("")
+            df[col] = values
     return df
 
 
+def duplicated_codes(*keys: pd.Series) -> np.ndarray:
+    """Like DataFrame.duplicated(keep="first") over key columns, via int64 factorize codes."""
+    codes = np.zeros(len(keys[0]), dtype=np.int64)
+    for key in keys:
+        key_codes, uniques = pd.factorize(key, use_na_sentinel=False)
+        # Re-factorize the combined code so it stays below len(df) and can't overflow
+        codes, _ = pd.factorize(codes * len(uniques) + key_codes)
+    return pd.Series(codes).duplicated(keep="first").to_numpy()
+
+
 def remove_duplicates(df: pd.DataFrame) -> pd.DataFrame:
     """
     Remove duplicates based on:
@@ -114,24 +219,19 @@ def remove_duplicates(df: pd.DataFrame) -> pd.DataFrame:
     before = len(df)
 
     # Normalize for comparison
-    df["_name_key"] = df["therapist_name"].str.lower().str.strip()
-    df["_addr_key"] = df.get("address", pd.Series(dtype=str)).fillna("").str.lower().str.strip()
-    df["_phone_key"] = df.get("phone", pd.Series(dtype=str)).fillna("").str.replace(r"\D", "", regex=True)
-
-    # Dedupe by place_id first (most reliable)
+    name_key = df["therapist_name"].str.lower().str.strip()
+    addr_key = df.get("address", pd.Series("", index=df.index)).fillna("").str.lower().str.strip()
+    phone_key = phone_digits(df.get("phone", pd.Series("", index=df.index)))
+
+    # Flag every duplicate in one pass, then slice once:
+    # same place_id (most reliable), same name + address, or same name + phone.
+    # Composite keys are compared as integer codes rather than string tuples.
+    is_dupe = duplicated_codes(name_key, addr_key)
     if "place_id" in df.columns:
-        df = df.drop_duplicates(subset=["place_id"], keep="first")
-
-    # Then by name + address
-    df = df.drop_duplicates(subset=["_name_key", "_addr_key"], keep="first")
-
-    # Then by name + phone (if phone exists)
-    mask = df["_phone_key"].str.len() >= 10
-    dupes = df[mask].duplicated(subset=["_name_key", "_phone_key"], keep="first")
-    df = df[~(mask & dupes)]
-
-    # Clean up temp columns
-    df = df.drop(columns=["_name_key", "_addr_key", "_phone_key"])
+        is_dupe = is_dupe | (df["place_id"].notna() & df["place_id"].duplicated(keep="first")).to_numpy()
+    has_phone = (phone_key.str.len() >= 10).to_numpy()
+    is_dupe = is_dupe | (has_phone & duplicated_codes(name_key, phone_key))
+    df = df[~is_dupe]
 
     after = len(df)
     logger.info(f"Deduplication: {before} -> {after} ({before - after} duplicates removed)")
@@ -147,20 +247,14 @@ def filter_non_therapists(df: pd.DataFrame) -> pd.DataFrame:
     cat_col = df.get("category", pd.Series("", index=df.index)).fillna("").str.lower()
 
     # Build exclusion mask from name
-    name_exclude = pd.Series(False, index=df.index)
-    for keyword in keywords["exclude_name_contains"]:
-        name_exclude |= name_col.str.contains(keyword.lower(), na=False)
+    name_exclude = contains_any(name_col, keyword_pattern(keywords["exclude_name_contains"]))
 
     # Build exclusion mask from category
-    cat_exclude = pd.Series(False, index=df.index)
-    for keyword in keywords["exclude_category_contains"]:
-        cat_exclude |= cat_col.str.contains(keyword.lower(), na=False)
+    cat_exclude = contains_any(cat_col, keyword_pattern(keywords["exclude_category_contains"]))
 
     # Build inclusion mask — if category matches a therapy type, keep it
     # even if name triggered a partial match
-    cat_include = pd.Series(False, index=df.index)
-    for keyword in keywords["include_category_contains"]:
-        cat_include |= cat_col.str.contains(keyword.lower(), na=False)
+    cat_include = contains_any(cat_col, keyword_pattern(keywords["include_category_contains"]))
 
     # Remove if name excludes AND category doesn't explicitly include
     exclude_mask = (name_exclude | cat_exclude) & ~cat_include
@@ -179,10 +273,8 @@ def remove_closed(df: pd.DataFrame) -> pd.DataFrame:
     status_col = df.get("status", pd.Series("", index=df.index)).fillna("").str.lower()
     name_col = df["therapist_name"].fillna("").str.lower()
 
-    closed_mask = pd.Series(False, index=df.index)
-    for indicator in keywords["exclude_permanently_closed_indicators"]:
-        closed_mask |= status_col.str.contains(indicator.lower(), na=False)
-        closed_mask |= name_col.str.contains(indicator.lower(), na=False)
+    closed_pattern = keyword_pattern(keywords["exclude_permanently_closed_indicators"])
+    closed_mask = contains_any(status_col, closed_pattern) | contains_any(name_col, closed_pattern)
 
     df = df[~closed_mask]
     after = len(df)
@@ -190,29 +282,68 @@ def remove_closed(df: pd.DataFrame) -> pd.DataFrame:
     return df.reset_index(drop=True)
 
 
-def standardize_fields(df: pd.DataFrame) -> pd.DataFrame:
+def clean_websites(urls: list) -> tuple[list[str], int]:
+    """Normalize URLs and blank out invalid ones. Returns (urls, invalid count)."""
+    cleaned = []
+    invalid_count = 0
+    for url in urls:
+        url = normalize_url(url)
+        if url and not is_valid_url(url):
+            url = ""
+            invalid_count += 1
+        cleaned.append(url)
+    return cleaned, invalid_count
+
+
+def clean_websites_parallel(urls: list, workers: int) -> tuple[list[str], int]:
+    """Run clean_websites over contiguous chunks in a process pool."""
+    chunk_size = -(-len(urls) // workers)
+    chunks = [urls[i:i + chunk_size] for i in range(0, len(urls), chunk_size)]
+    cleaned = []
+    invalid_count = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_urls, chunk_invalid in executor.map(clean_websites, chunks):
+            cleaned.extend(chunk_urls)
+            invalid_count += chunk_invalid
+    return cleaned, invalid_count
+
+
+def standardize_fields(df: pd.DataFrame, workers: int = 1) -> pd.DataFrame:
     """Apply formatting standards to all fields."""
-    # Phone
+    # Phone — same rules as utils.standardize_phone, as whole-column string ops
     if "phone" in df.columns:
-        df["phone"] = df["phone"].apply(standardize_phone)
+        digits = phone_digits(df["phone"])
+        has_country_code = (digits.str.len() == 11) & digits.str.startswith("1")
+        digits = digits.where(~has_country_code, digits.str[1:])
+        formatted = "(" + digits.str[:3] + ") " + digits.str[3:6] + "-" + digits.str[6:]
+        df["phone"] = formatted.where(digits.str.len() == 10, "")
 
-    # State
+    # State — only a handful of distinct values, so standardize each once
     if "state" in df.columns:
-        df["state"] = df["state"].apply(standardize_state)
+        states = df["state"].fillna("").astype(str)
+        df["state"] = states.map({s: standardize_state(s) for s in states.unique()}).astype("category")
 
-    # Address
+    # Address — same rules as utils.standardize_address
     if "address" in df.columns:
-        df["address"] = df["address"].apply(standardize_address)
-
-    # Website
+        address = df["address"].fillna("").astype(str).str.replace(ADDRESS_EDGES, "", regex=True)
+        address = address.str.replace(ADDRESS_COMMA, ", ", regex=True).str.title()
+        # RE2's \b only treats ASCII as word characters. That only matters for
+        # a token touching a non-ASCII letter or digit ("Dcé"), which doesn't
+        # occur in real addresses, so the difference from utils is accepted.
+        for token in ADDRESS_UPPER_TOKENS:
+            address = address.str.replace(rf"\b{token}\b", token.upper(), regex=True)
+        df["address"] = address
+
+    # Website — normalize and remove invalid URLs
     if "website" in df.columns:
-        df["website"] = df["website"].apply(normalize_url)
-        # Remove invalid URLs
-        valid_mask = df["website"].apply(lambda x: is_valid_url(x) if x else True)
-        invalid_count = (~valid_mask & df["website"].astype(bool)).sum()
+        urls = df["website"].tolist()
+        if workers > 1 and len(urls) >= PARALLEL_MIN_ROWS:
+            cleaned, invalid_count = clean_websites_parallel(urls, workers)
+        else:
+            cleaned, invalid_count = clean_websites(urls)
         if invalid_count > 0:
             logger.info(f"Cleared {invalid_count} invalid URLs")
-        df.loc[~valid_mask, "website"] = ""
+        df["website"] = pd.Series(cleaned, index=df.index, dtype=STRING_DTYPE)
 
     # Ratings — ensure numeric
     if "google_rating" in df.columns:
@@ -229,33 +360,51 @@ def standardize_fields(df: pd.DataFrame) -> pd.DataFrame:
 
 def add_derived_fields(df: pd.DataFrame) -> pd.DataFrame:
     """Add computed fields: license_type guess, group practice flag, etc."""
-    category_col = df.get("category", pd.Series("", index=df.index)).fillna("")
-
-    # Guess license type from name/category
-    df["license_type"] = df.apply(
-        lambda row: guess_license_type(
-            row.get("therapist_name", ""),
-            category_col.get(row.name, ""),
-        ),
-        axis=1,
+    names = df["therapist_name"].fillna("").astype(str)
+    categories = df.get("category", pd.Series("", index=df.index)).fillna("").astype(str)
+
+    # Guess license type from name/category — same priority as
+    # utils.guess_license_type, one column-wide match per license type
+    text = (names + " " + categories).str.lower()
+    matches = [contains_any(text, keyword_pattern(keywords)) for _, keywords in LICENSE_TYPE_KEYWORDS]
+    df["license_type"] = pd.Categorical(
+        np.select(matches, [license_type for license_type, _ in LICENSE_TYPE_KEYWORDS], default="").tolist()
     )
 
-    # Flag group practices
-    df["is_group_practice"] = df["therapist_name"].apply(is_group_practice)
+    # Flag group practices — same rule as utils.is_group_practice
+    df["is_group_practice"] = contains_any(names.str.lower(), keyword_pattern(GROUP_PRACTICE_INDICATORS))
 
     # Set data pipeline fields
-    df["data_source"] = "outscraper"
-    df["enrichment_status"] = "cleaned"
+    df["data_source"] = pd.Categorical(["outscraper"] * len(df))
+    df["enrichment_status"] = pd.Categorical(["cleaned"] * len(df))
     df["last_verified_date"] = ""
 
     return df
 
 
-def validate_urls_live(df: pd.DataFrame, timeout: float = 5.0, sample_size: int = 0) -> pd.DataFrame:
+def check_url(url: str, timeout: float) -> bool:
+    """Return True if the URL answers a HEAD request without an error status."""
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = _thread_local.session = requests.Session()
+    try:
+        resp = session.head(url, timeout=timeout, allow_redirects=True)
+        return resp.status_code < 400
+    except (requests.RequestException, Exception):
+        return False
+
+
+def validate_urls_live(
+    df: pd.DataFrame,
+    timeout: float = 5.0,
+    sample_size: int = 0,
+    max_workers: int = URL_CHECK_WORKERS,
+) -> pd.DataFrame:
     """
     Optionally check if websites are reachable.
     Set sample_size > 0 to only check a sample (for speed).
     Set sample_size = 0 to skip live validation.
+    URLs are checked concurrently across max_workers threads.
     """
     if sample_size == 0:
         logger.info("Skipping live URL validation (use --validate-urls N to enable)")
@@ -265,15 +414,16 @@ def validate_urls_live(df: pd.DataFrame, timeout: float = 5.0, sample_size: int
     if sample_size > 0 and len(urls_to_check) > sample_size:
         urls_to_check = urls_to_check.sample(n=sample_size, random_state=42)
 
-    logger.info(f"Checking {len(urls_to_check)} URLs for reachability...")
+    logger.info(f"Checking {len(urls_to_check)} URLs for reachability ({max_workers} workers)...")
     dead_indices = []
-    for idx, row in urls_to_check.iterrows():
-        try:
-            resp = requests.head(row["website"], timeout=timeout, allow_redirects=True)
-            if resp.status_code >= 400:
-                dead_indices.append(idx)
-        except (requests.RequestException, Exception):
-            dead_indices.append(idx)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(check_url, url, timeout): idx
+            for idx, url in urls_to_check["website"].items()
+        }
+        for future in as_completed(futures):
+            if not future.result():
+                dead_indices.append(futures[future])
 
     if dead_indices:
         logger.info(f"Found {len(dead_indices)} unreachable URLs — clearing them")
@@ -289,6 +439,12 @@ def print_summary(df: pd.DataFrame) -> None:
     logger.info("=" * 60)
     logger.info(f"Total records: {len(df)}")
 
+    def count_non_empty(col: str) -> int:
+        values = df.get(col)
+        if values is None:
+            return 0
+        return int((values.fillna("").astype(str).str.len() > 0).sum())
+
     if "state" in df.columns:
         state_counts = df["state"].value_counts()
         logger.info(f"Records by state:")
@@ -303,8 +459,8 @@ def print_summary(df: pd.DataFrame) -> None:
             label = lt if lt else "(unknown)"
             logger.info(f"  {label}: {count}")
 
-    has_phone = (df.get("phone", pd.Series(dtype=str)).fillna("").astype(bool)).sum()
-    has_website = (df.get("website", pd.Series(dtype=str)).fillna("").astype(bool)).sum()
+    has_phone = count_non_empty("phone")
+    has_website = count_non_empty("website")
     has_rating = (df.get("google_rating", pd.Series(dtype=float)).notna()).sum()
     group_count = df.get("is_group_practice", pd.Series(dtype=bool)).sum()
 
@@ -322,7 +478,7 @@ def main():
     parser.add_argument(
         "--input", "-i",
         required=True,
-        help="Path to raw CSV file or directory of CSVs from OutScraper",
+        help="Path to raw CSV/Parquet file or directory of them from OutScraper",
     )
     parser.add_argument(
         "--output", "-o",
@@ -339,7 +495,13 @@ def main():
     parser.add_argument(
         "--output-filename",
         default="therapists_cleaned.csv",
-        help="Name of the output CSV file (default: therapists_cleaned.csv)",
+        help="Name of the output file: .csv, .csv.gz, .csv.zst or .parquet (default: therapists_cleaned.csv)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help=f"Processes for website cleaning on frames over {PARALLEL_MIN_ROWS:,} rows (default: CPU count)",
     )
     args = parser.parse_args()
 
@@ -364,7 +526,7 @@ def main():
     df = remove_duplicates(df)
 
     # Step 4: Standardize fields
-    df = standardize_fields(df)
+    df = standardize_fields(df, workers=args.workers)
 
     # Step 5: Live URL validation (optional)
     df = validate_urls_live(df, sample_size=args.validate_urls)
@@ -379,7 +541,7 @@ def main():
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
     output_path = output_dir / args.output_filename
-    df.to_csv(output_path, index=False, encoding="utf-8")
+    write_table(df, output_path)
     logger.info(f"Cleaned data written to: {output_path}")
     logger.info(f"Ready for enrichment pipeline (scripts/enrich_data.py)")
 
@@ -22,6 +22,7 @@ import re
 import sys
 import time
 from pathlib import Path
+from urllib.parse import urljoin, urlparse
 
 # Fix Windows encoding issues with Crawl4AI's Rich console (unicode arrows etc.)
 os.environ.setdefault("PYTHONIOENCODING", "utf-8")
@@ -30,20 +31,37 @@ os.environ.setdefault("PYTHONIOENCODING", "utf-8")
 if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
+import numpy as np
 import pandas as pd
 
+# Optional: google-re2 (pip install google-re2) matches the language and
+# education patterns with a linear-time DFA, 4-10x faster than re on crawled
+# pages. Falls back to the standard library when not installed.
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Optional: selectolax (pip install selectolax) finds profile images with one
+# pass of the Lexbor C parser. Falls back to PROFILE_IMAGE_PATTERNS.
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 from utils import (
     setup_logging,
+    read_table,
+    write_table,
+    TABLE_SUFFIXES,
     load_insurance_lookup,
     load_specialization_lookup,
     load_approach_lookup,
+    lower_text,
     match_insurance,
     match_specializations,
-    detect_accepting_patients,
-    detect_telehealth,
-    detect_sliding_scale,
-    detect_telehealth_platform,
+    analyze_bio,
     extract_price_range,
 )
 
@@ -67,6 +85,75 @@ ENRICHMENT_FIELDS = [
 ]
 
 
+def compile_text_pattern(pattern: str, ignore_case: bool = False):
+    """Compile a text-scanning pattern with re2 when available, else re."""
+    if re2 is not None:
+        return re2.compile(("(?i)" if ignore_case else "") + pattern)
+    return re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+
+
+# Default number of sites crawled at once within a batch
+DEFAULT_CONCURRENCY = 5
+
+# Keywords marking a therapist profile image in an <img> class/id or alt text
+PROFILE_IMAGE_CLASS_KEYWORDS = ["profile", "headshot", "photo", "avatar", "therapist", "portrait"]
+PROFILE_IMAGE_ALT_KEYWORDS = ["photo", "headshot", "profile"]
+
+# Regex equivalents of the keyword checks, used when selectolax isn't installed
+PROFILE_IMAGE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in [
+        r'<img[^>]+(?:class|id)=["\'][^"\']*(?:profile|headshot|photo|avatar|therapist|portrait)[^"\']*["\'][^>]+src=["\']([^"\']+)["\']',
+        r'<img[^>]+src=["\']([^"\']+)["\'][^>]+(?:class|id)=["\'][^"\']*(?:profile|headshot|photo|avatar|therapist|portrait)[^"\']*["\']',
+        r'<img[^>]+alt=["\'][^"\']*(?:photo|headshot|profile)[^"\']*["\'][^>]+src=["\']([^"\']+)["\']',
+    ]
+]
+
+# Education sections: (pattern, run against lowercased text). The section-header
+# pattern reports lowercased findings; the others keep the original casing.
+EDUCATION_PATTERNS = [
+    (compile_text_pattern(r"(?:education|credentials|degree|training|qualifications)[:\s]*([^\n]{10,200})", ignore_case=True), True),
+    (compile_text_pattern(r"(?:earned|received|graduated|completed)\s+(?:a\s+|an\s+)?([^\n]{10,150})", ignore_case=True), False),
+    (compile_text_pattern(r"((?:M\.?A\.?|M\.?S\.?|Ph\.?D\.?|Psy\.?D\.?|M\.?D\.?|Ed\.?D\.?|M\.?S\.?W\.?|B\.?A\.?|B\.?S\.?)\s+(?:in\s+)?[^\n,]{5,100})", ignore_case=True), False),
+]
+
+# Language keyword -> canonical language name
+LANGUAGE_MAP = {
+    "english": "English",
+    "spanish": "Spanish",
+    "espanol": "Spanish",
+    "español": "Spanish",
+    "mandarin": "Mandarin",
+    "chinese": "Mandarin",
+    "korean": "Korean",
+    "vietnamese": "Vietnamese",
+    "french": "French",
+    "arabic": "Arabic",
+    "amharic": "Amharic",
+    "asl": "ASL",
+    "american sign language": "ASL",
+    "sign language": "ASL",
+    "portuguese": "Portuguese",
+    "hindi": "Hindi",
+    "urdu": "Urdu",
+    "tagalog": "Tagalog",
+    "farsi": "Farsi",
+    "persian": "Farsi",
+    "russian": "Russian",
+    "japanese": "Japanese",
+    "german": "German",
+    "italian": "Italian",
+    "haitian creole": "Haitian Creole",
+    "creole": "Haitian Creole",
+}
+
+# All language keywords as one alternation over lowercased text, longest first
+# so e.g. "american sign language" wins over "sign language"
+LANGUAGE_PATTERN = compile_text_pattern(
+    r"\b(" + "|".join(re.escape(k) for k in sorted(LANGUAGE_MAP, key=len, reverse=True)) + r")\b"
+)
+
+
 async def crawl_website(url: str, crawler) -> str | None:
     """
     Crawl a single therapist website and return the extracted text content.
@@ -84,43 +171,45 @@ async def crawl_website(url: str, crawler) -> str | None:
         return None
 
 
+def find_profile_image_src(html_content: str) -> str:
+    """Return the src of the first profile-looking <img>: class/id match first, then alt."""
+    if LexborHTMLParser is None:
+        for pattern in PROFILE_IMAGE_PATTERNS:
+            match = pattern.search(html_content)
+            if match:
+                return match.group(1)
+        return ""
+
+    images = [img.attributes for img in LexborHTMLParser(html_content).css("img[src]")]
+    images = [attrs for attrs in images if attrs["src"]]
+    for attrs in images:
+        marker = f"{attrs.get('class') or ''} {attrs.get('id') or ''}".lower()
+        if any(kw in marker for kw in PROFILE_IMAGE_CLASS_KEYWORDS):
+            return attrs["src"]
+    for attrs in images:
+        alt = (attrs.get("alt") or "").lower()
+        if any(kw in alt for kw in PROFILE_IMAGE_ALT_KEYWORDS):
+            return attrs["src"]
+    return ""
+
+
 def extract_profile_image(html_content: str, url: str) -> str:
     """Try to find a profile/headshot image from the crawled content."""
     if not html_content:
         return ""
-    # Common patterns for therapist profile images
-    img_patterns = [
-        r'<img[^>]+(?:class|id)=["\'][^"\']*(?:profile|headshot|photo|avatar|therapist|portrait)[^"\']*["\'][^>]+src=["\']([^"\']+)["\']',
-        r'<img[^>]+src=["\']([^"\']+)["\'][^>]+(?:class|id)=["\'][^"\']*(?:profile|headshot|photo|avatar|therapist|portrait)[^"\']*["\']',
-        r'<img[^>]+alt=["\'][^"\']*(?:photo|headshot|profile)[^"\']*["\'][^>]+src=["\']([^"\']+)["\']',
-    ]
-    for pattern in img_patterns:
-        match = re.search(pattern, html_content, re.IGNORECASE)
-        if match:
-            img_url = match.group(1)
-            if img_url.startswith("/"):
-                # Relative URL — make absolute
-                from urllib.parse import urlparse
-                parsed = urlparse(url)
-                img_url = f"{parsed.scheme}://{parsed.netloc}{img_url}"
-            return img_url
-    return ""
+    img_url = find_profile_image_src(html_content)
+    # Resolve relative URLs (/img/a.jpg, img/a.jpg, ../a.jpg, //cdn/a.jpg)
+    return urljoin(url, img_url) if img_url else ""
 
 
 def extract_education(text: str) -> str:
     """Extract education/credentials from text."""
     if not text:
         return ""
-    # Look for education sections
-    edu_patterns = [
-        r"(?:education|credentials|degree|training|qualifications)[:\s]*([^\n]{10,200})",
-        r"(?:earned|received|graduated|completed)\s+(?:a\s+|an\s+)?([^\n]{10,150})",
-        r"((?:M\.?A\.?|M\.?S\.?|Ph\.?D\.?|Psy\.?D\.?|M\.?D\.?|Ed\.?D\.?|M\.?S\.?W\.?|B\.?A\.?|B\.?S\.?)\s+(?:in\s+)?[^\n,]{5,100})",
-    ]
     findings = []
-    text_lower = text.lower()
-    for pattern in edu_patterns:
-        matches = re.findall(pattern, text_lower if pattern.startswith("(?:education") else text, re.IGNORECASE)
+    text_lower = lower_text(text)
+    for pattern, match_lowercased in EDUCATION_PATTERNS:
+        matches = pattern.findall(text_lower if match_lowercased else text)
         for m in matches:
             cleaned = m.strip().rstrip(".,;")
             if len(cleaned) > 10 and cleaned not in findings:
@@ -132,40 +221,7 @@ def extract_languages(text: str) -> list[str]:
     """Extract languages spoken from text."""
     if not text:
         return []
-    language_map = {
-        "english": "English",
-        "spanish": "Spanish",
-        "espanol": "Spanish",
-        "español": "Spanish",
-        "mandarin": "Mandarin",
-        "chinese": "Mandarin",
-        "korean": "Korean",
-        "vietnamese": "Vietnamese",
-        "french": "French",
-        "arabic": "Arabic",
-        "amharic": "Amharic",
-        "asl": "ASL",
-        "american sign language": "ASL",
-        "sign language": "ASL",
-        "portuguese": "Portuguese",
-        "hindi": "Hindi",
-        "urdu": "Urdu",
-        "tagalog": "Tagalog",
-        "farsi": "Farsi",
-        "persian": "Farsi",
-        "russian": "Russian",
-        "japanese": "Japanese",
-        "german": "German",
-        "italian": "Italian",
-        "haitian creole": "Haitian Creole",
-        "creole": "Haitian Creole",
-    }
-    text_lower = text.lower()
-    found = set()
-    for keyword, canonical in language_map.items():
-        if keyword in text_lower:
-            found.add(canonical)
-    return sorted(found)
+    return sorted({LANGUAGE_MAP[m] for m in LANGUAGE_PATTERN.findall(lower_text(text))})
 
 
 def enrich_from_text(
@@ -186,8 +242,8 @@ def enrich_from_text(
     insurances = match_insurance(text, insurance_lookup)
     result["insurance_accepted"] = ", ".join(insurances) if insurances else ""
 
-    # Sliding scale
-    result["sliding_scale"] = detect_sliding_scale(text)
+    # Accepting new patients, telehealth (and platform), sliding scale
+    result.update(analyze_bio(text))
 
     # Price range
     price_min, price_max = extract_price_range(text)
@@ -202,13 +258,6 @@ def enrich_from_text(
     approaches = match_specializations(text, approach_lookup)
     result["therapy_approaches"] = ", ".join(approaches) if approaches else ""
 
-    # Telehealth
-    result["telehealth"] = detect_telehealth(text)
-    result["telehealth_platform"] = detect_telehealth_platform(text)
-
-    # Accepting new patients
-    result["accepting_new_patients"] = detect_accepting_patients(text)
-
     # Education
     result["education"] = extract_education(text)
 
@@ -234,8 +283,13 @@ async def process_batch(
     spec_lookup: dict,
     approach_lookup: dict,
     delay: float,
+    concurrency: int = DEFAULT_CONCURRENCY,
 ) -> list[dict]:
-    """Process a batch of therapist websites concurrently."""
+    """
+    Process a batch of therapist websites concurrently.
+    Up to `concurrency` sites are crawled at once; requests to the same host
+    are serialized and spaced `delay` seconds apart.
+    """
     try:
         from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, BrowserConfig
     except ImportError:
@@ -246,36 +300,54 @@ async def process_batch(
 
     end_idx = min(start_idx + batch_size, len(df))
     batch = df.iloc[start_idx:end_idx]
-    results = []
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    host_locks: dict[str, asyncio.Lock] = {}
+
+    async def enrich_row(crawler, idx, url: str, name: str) -> dict:
+        if not url:
+            return {field: "" for field in ENRICHMENT_FIELDS}
+
+        async with host_locks.setdefault(urlparse(url).netloc, asyncio.Lock()):
+            async with semaphore:
+                logger.info(f"  [{idx + 1}/{len(df)}] Crawling: {name} - {url}")
+                text = await crawl_website(url, crawler)
+            # Be polite — hold this host for the delay before its next request
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        if text is None:
+            logger.debug(f"  No content extracted for {url}")
+            return {field: "" for field in ENRICHMENT_FIELDS}
+        # Extract in a worker thread so the event loop keeps driving crawls
+        return await loop.run_in_executor(
+            None, enrich_from_text,
+            text, text, url,
+            insurance_lookup, spec_lookup, approach_lookup,
+        )
 
     browser_cfg = BrowserConfig(headless=True, verbose=False)
     async with AsyncWebCrawler(config=browser_cfg, verbose=False) as crawler:
-        for idx, row in batch.iterrows():
-            url = row.get("website", "")
-            name = row.get("therapist_name", "unknown")
-
-            if not url:
-                results.append({field: "" for field in ENRICHMENT_FIELDS})
-                continue
-
-            logger.info(f"  [{idx + 1}/{len(df)}] Crawling: {name} - {url}")
-
-            text = await crawl_website(url, crawler)
-            if text is None:
-                results.append({field: "" for field in ENRICHMENT_FIELDS})
-                logger.debug(f"  No content extracted for {url}")
-            else:
-                enriched = enrich_from_text(
-                    text, text, url,
-                    insurance_lookup, spec_lookup, approach_lookup,
-                )
-                results.append(enriched)
-
-            # Be polite — delay between requests
-            if delay > 0:
-                await asyncio.sleep(delay)
+        results = await asyncio.gather(*(
+            enrich_row(crawler, idx, url, name)
+            for idx, url, name in zip(
+                batch.index,
+                batch["website"].fillna("").tolist(),
+                batch["therapist_name"].fillna("unknown").tolist(),
+            )
+        ))
 
-    return results
+    return list(results)
+
+
+def apply_results(df: pd.DataFrame, resume_idx: int, results: dict[str, list]) -> pd.DataFrame:
+    """
+    Return the rows of df processed so far: rows before resume_idx as loaded,
+    followed by the crawled rows with their enrichment columns from results.
+    """
+    end_idx = resume_idx + len(results[ENRICHMENT_FIELDS[0]])
+    crawled = df.iloc[resume_idx:end_idx].assign(**results)
+    return pd.concat([df.iloc[:resume_idx], crawled])
 
 
 def print_enrichment_summary(df: pd.DataFrame) -> None:
@@ -302,13 +374,19 @@ def main():
     parser.add_argument(
         "--input", "-i",
         required=True,
-        help="Path to cleaned CSV from Phase 2",
+        help="Path to cleaned CSV (or Parquet) from Phase 2",
     )
     parser.add_argument(
         "--output", "-o",
         required=True,
         help="Output directory for enriched CSV",
     )
+    parser.add_argument(
+        "--output-format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="File format for the output and checkpoints (default: csv)",
+    )
     parser.add_argument(
         "--limit",
         type=int,
@@ -325,7 +403,13 @@ def main():
         "--delay",
         type=float,
         default=1.0,
-        help="Delay in seconds between requests (default: 1.0)",
+        help="Delay in seconds between requests to the same host (default: 1.0)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Number of websites crawled at once (default: {DEFAULT_CONCURRENCY})",
     )
     parser.add_argument(
         "--resume-from",
@@ -335,8 +419,10 @@ def main():
     )
     parser.add_argument(
         "--output-filename",
-        default="therapists_enriched.csv",
-        help="Name of the output CSV file",
+        default=None,
+        help="Name of the output file; kept as-is if it ends in .csv, .csv.gz, "
+        ".csv.zst or .parquet, otherwise suffixed per --output-format "
+        "(default: therapists_enriched.<format>)",
     )
     args = parser.parse_args()
 
@@ -347,7 +433,7 @@ def main():
         sys.exit(1)
 
     logger.info(f"Loading cleaned data from: {input_path}")
-    df = pd.read_csv(input_path, dtype=str)
+    df = read_table(input_path)
     logger.info(f"Loaded {len(df)} records")
 
     # Apply limit
@@ -373,11 +459,10 @@ def main():
     # Process in batches
     start_time = time.time()
     start_idx = args.resume_from
-    all_results = []
 
-    # Pre-fill results for rows before resume point
-    for i in range(start_idx):
-        all_results.append({field: df.iloc[i].get(field, "") for field in ENRICHMENT_FIELDS})
+    # Results are kept column-wise (field -> one value per crawled row) and only
+    # for rows from the resume point on; earlier rows keep their input values
+    results = {field: [] for field in ENRICHMENT_FIELDS}
 
     while start_idx < len(df):
         batch_end = min(start_idx + args.batch_size, len(df))
@@ -387,33 +472,33 @@ def main():
             process_batch(
                 df, start_idx, args.batch_size,
                 insurance_lookup, spec_lookup, approach_lookup,
-                args.delay,
+                args.delay, args.concurrency,
             )
         )
-        all_results.extend(batch_results)
+        for row_result in batch_results:
+            for field in ENRICHMENT_FIELDS:
+                results[field].append(row_result.get(field, ""))
         start_idx += args.batch_size
 
         # Save checkpoint every 5 batches
         if (start_idx // args.batch_size) % 5 == 0:
             output_dir = Path(args.output)
             output_dir.mkdir(parents=True, exist_ok=True)
-            checkpoint_path = output_dir / "enrichment_checkpoint.csv"
-            temp_df = df.iloc[:len(all_results)].copy()
-            for field in ENRICHMENT_FIELDS:
-                temp_df[field] = [r.get(field, "") for r in all_results]
-            temp_df.to_csv(checkpoint_path, index=False, encoding="utf-8")
-            logger.info(f"Checkpoint saved: {checkpoint_path} ({len(all_results)} rows)")
+            checkpoint_path = output_dir / f"enrichment_checkpoint.{args.output_format}"
+            temp_df = apply_results(df, args.resume_from, results)
+            write_table(temp_df, checkpoint_path)
+            logger.info(f"Checkpoint saved: {checkpoint_path} ({len(temp_df)} rows)")
 
     # Apply enrichment results to dataframe
-    for field in ENRICHMENT_FIELDS:
-        df[field] = [r.get(field, "") for r in all_results[:len(df)]]
+    df = apply_results(df, args.resume_from, results)
 
     # Update enrichment status
-    df["enrichment_status"] = df.apply(
-        lambda row: "enriched_full" if row.get("insurance_accepted") else
-                    "enriched_basic" if any(row.get(f) for f in ["specializations", "telehealth", "accepting_new_patients"]) else
-                    "cleaned",
-        axis=1,
+    has_insurance = df["insurance_accepted"].fillna("").astype(bool)
+    has_basic = df[["specializations", "telehealth", "accepting_new_patients"]].fillna("").astype(bool).any(axis=1)
+    df["enrichment_status"] = np.select(
+        [has_insurance, has_basic],
+        ["enriched_full", "enriched_basic"],
+        default="cleaned",
     )
 
     # Summary
@@ -424,13 +509,16 @@ def main():
     # Write output
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
-    output_path = output_dir / args.output_filename
-    df.to_csv(output_path, index=False, encoding="utf-8")
+    output_filename = args.output_filename or "therapists_enriched"
+    if not output_filename.endswith(TABLE_SUFFIXES):
+        output_filename = f"{Path(output_filename).name.split('.')[0]}.{args.output_format}"
+    output_path = output_dir / output_filename
+    write_table(df, output_path)
     logger.info(f"Enriched data written to: {output_path}")
     logger.info(f"Ready for GeoDirectory import (scripts/prepare_import.py)")
 
     # Clean up checkpoint
-    checkpoint = output_dir / "enrichment_checkpoint.csv"
+    checkpoint = output_dir / f"enrichment_checkpoint.{args.output_format}"
     if checkpoint.exists():
         checkpoint.unlink()
         logger.info("Checkpoint file removed")
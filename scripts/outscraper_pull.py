@@ -14,10 +14,13 @@ Usage:
 """
 
 import argparse
+import asyncio
 import os
+import random
 import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import pandas as pd
@@ -25,13 +28,58 @@ from dotenv import load_dotenv
 from outscraper import ApiClient
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from utils import setup_logging, load_config, PROJECT_ROOT
+from utils import setup_logging, load_config, write_table, PROJECT_ROOT
 
 logger = setup_logging("outscraper_pull")
 
 # Load .env from project root
 load_dotenv(PROJECT_ROOT / ".env")
 
+# Runs of anything but lowercase letters/digits become one underscore in slugs
+SLUG_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+# Max OutScraper requests in flight at once in config mode
+DEFAULT_CONCURRENCY = 8
+
+# Search queries sent per OutScraper request in config mode (the API takes a list)
+QUERY_BATCH_SIZE = 10
+
+# Retry backoff: full jitter, wait = uniform(0, min(cap, base * 2^attempt)) seconds
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+# Bad request, bad API key, no credits, forbidden — retrying won't help
+FATAL_STATUS_CODES = {400, 401, 402, 403}
+
+# Polling OutScraper async jobs in config mode: the wait doubles from base to
+# cap between polls, and a job still pending after the timeout is abandoned
+POLL_BASE_DELAY = 2.0
+POLL_MAX_DELAY = 30.0
+POLL_TIMEOUT = 30 * 60
+
+# Rename API columns to our standardized names. subtypes (detailed) wins over
+# category (single), and state_code (e.g. "DC") over state ("District Of Columbia")
+RENAME_MAP = {
+    "address": "full_address",
+    "postal_code": "zip_code",
+    "website": "site",
+    "business_status": "status",
+    "photo": "photo_url",
+    "subtypes": "category",
+    "state_code": "state",
+}
+
+# Raw columns kept from each OutScraper result, in output order
+KEEP_COLS = [
+    "name", "full_address", "street", "city", "state", "zip_code",
+    "country_code", "phone", "site", "rating", "reviews", "category",
+    "working_hours", "latitude", "longitude", "place_id", "google_id",
+    "status", "photo_url", "description",
+]
+
+# Per-location output files written in parallel (I/O-bound)
+WRITE_WORKERS = 4
+
 
 def get_client() -> ApiClient:
     """Initialize OutScraper API client from environment variable."""
@@ -44,54 +92,155 @@ def get_client() -> ApiClient:
 
 def slugify(text: str) -> str:
     """Convert text to filename-safe slug."""
-    text = text.lower().strip()
-    text = re.sub(r"[^a-z0-9]+", "_", text)
-    return text.strip("_")
+    return SLUG_NON_ALNUM.sub("_", text.lower().strip()).strip("_")
 
 
-def pull_google_maps(
-    client: ApiClient,
-    query: str,
-    location: str,
-    limit: int = 100,
-    max_retries: int = 3,
-) -> list[dict]:
+def is_retryable(error: Exception) -> bool:
+    """False for auth/request errors that will fail again; True for 429, 5xx and network errors."""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        # The OutScraper SDK raises plain Exceptions with the status code in the message
+        match = re.search(r"\b([45]\d\d)\b", str(error))
+        status = int(match.group(1)) if match else None
+    return status not in FATAL_STATUS_CODES
+
+
+def call_with_retries(label: str, func, *args, max_retries: int = 3, **kwargs):
     """
-    Pull Google Maps results from OutScraper with retry logic.
-    Returns list of result dicts.
+    Call an OutScraper client method, retrying recoverable errors with
+    full-jitter backoff. Returns None once it gives up.
     """
-    search_query = f"{query}, {location}"
-    logger.info(f"Querying OutScraper: \"{search_query}\" (limit={limit})")
-
     for attempt in range(1, max_retries + 1):
         try:
-            results = client.google_maps_search(
-                [search_query],
-                limit=limit,
-                language="en",
-                region="US",
-            )
-            break
+            return func(*args, **kwargs)
         except Exception as e:
+            if not is_retryable(e):
+                logger.error(f"Unrecoverable error for {label}: {e}")
+                return None
             if attempt < max_retries:
-                wait = 10 * attempt
-                logger.warning(f"Attempt {attempt} failed: {e}. Retrying in {wait}s...")
+                wait = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+                logger.warning(f"Attempt {attempt} failed: {e}. Retrying in {wait:.1f}s...")
                 time.sleep(wait)
             else:
-                logger.error(f"All {max_retries} attempts failed for \"{search_query}\": {e}")
-                return []
+                logger.error(f"All {max_retries} attempts failed for {label}: {e}")
+                return None
 
+
+def split_results(search_queries: list[str], results) -> list[list[dict]]:
+    """Split an OutScraper response into one list of result dicts per search query."""
     # OutScraper returns a list of lists (one per query)
     if results and isinstance(results, list):
         if isinstance(results[0], list):
-            records = results[0]
+            per_query = results
         else:
-            records = results
+            per_query = [results]
     else:
-        records = []
+        per_query = []
+    per_query = (per_query + [[] for _ in search_queries])[:len(search_queries)]
+
+    for search_query, records in zip(search_queries, per_query):
+        logger.info(f"Received {len(records)} results for \"{search_query}\"")
+    return per_query
+
+
+def query_label(search_queries: list[str]) -> str:
+    """Quoted, comma-joined search queries for log messages."""
+    return ", ".join(f"\"{q}\"" for q in search_queries)
+
+
+def pull_google_maps_batch(
+    client: ApiClient,
+    search_queries: list[str],
+    limit: int = 100,
+    max_retries: int = 3,
+) -> list[list[dict]]:
+    """
+    Pull Google Maps results for several "query, location" strings in one
+    OutScraper request, with retry logic. Blocks until OutScraper finishes.
+    Returns one list of result dicts per search query, in order.
+    """
+    label = query_label(search_queries)
+    logger.info(f"Querying OutScraper: {label} (limit={limit})")
+    results = call_with_retries(
+        label, client.google_maps_search, search_queries,
+        limit=limit, language="en", region="US", max_retries=max_retries,
+    )
+    return split_results(search_queries, results)
 
-    logger.info(f"Received {len(records)} results for \"{search_query}\"")
-    return records
+
+def pull_google_maps(
+    client: ApiClient,
+    query: str,
+    location: str,
+    limit: int = 100,
+    max_retries: int = 3,
+) -> list[dict]:
+    """
+    Pull Google Maps results from OutScraper with retry logic.
+    Returns list of result dicts.
+    """
+    return pull_google_maps_batch(client, [f"{query}, {location}"], limit, max_retries)[0]
+
+
+async def pull_google_maps_async(
+    client: ApiClient,
+    sem: asyncio.Semaphore,
+    search_queries: list[str],
+    limit: int = 100,
+) -> list[list[dict]]:
+    """
+    Submit a batch of search queries as an OutScraper async job, then poll its
+    request archive until the job finishes. sem bounds the HTTP calls in flight,
+    not the jobs, so every job is queued on OutScraper's side up front.
+    Returns one list of result dicts per search query, in order.
+    """
+    label = query_label(search_queries)
+    logger.info(f"Submitting OutScraper job: {label} (limit={limit})")
+    async with sem:
+        job = await asyncio.to_thread(
+            call_with_retries, label, client.google_maps_search, search_queries,
+            limit=limit, language="en", region="US", async_request=True,
+        )
+    if not job or "id" not in job:
+        return [[] for _ in search_queries]
+
+    waited = 0.0
+    delay = POLL_BASE_DELAY
+    while True:
+        await asyncio.sleep(delay)
+        waited += delay
+        async with sem:
+            archive = await asyncio.to_thread(call_with_retries, label, client.get_request_archive, job["id"])
+        if archive is None:
+            return [[] for _ in search_queries]
+        if archive.get("status") != "Pending":
+            break
+        if waited >= POLL_TIMEOUT:
+            logger.error(f"Job {job['id']} still pending after {POLL_TIMEOUT}s, giving up on {label}")
+            return [[] for _ in search_queries]
+        delay = min(POLL_MAX_DELAY, delay * 2)
+
+    if archive.get("status") != "Success":
+        logger.error(f"Job {job['id']} ended with status {archive.get('status')!r} for {label}")
+        return [[] for _ in search_queries]
+    return split_results(search_queries, archive.get("data"))
+
+
+async def pull_all(
+    client: ApiClient,
+    queries: list[dict],
+    limit: int,
+    concurrency: int,
+) -> list[list[dict]]:
+    """Run all queries as concurrent async jobs, QUERY_BATCH_SIZE per job. Results come back in query order."""
+    sem = asyncio.Semaphore(concurrency)
+    batches = [queries[i:i + QUERY_BATCH_SIZE] for i in range(0, len(queries), QUERY_BATCH_SIZE)]
+    tasks = [
+        pull_google_maps_async(client, sem, [f"{q['search_term']}, {q['location']}" for q in batch], limit)
+        for batch in batches
+    ]
+    batch_results = await asyncio.gather(*tasks)
+    return [records for results in batch_results for records in results]
 
 
 def records_to_dataframe(records: list[dict]) -> pd.DataFrame:
@@ -101,46 +250,19 @@ def records_to_dataframe(records: list[dict]) -> pd.DataFrame:
 
     df = pd.DataFrame(records)
 
-    # Rename API columns to our standardized names
-    rename_map = {
-        "address": "full_address",
-        "postal_code": "zip_code",
-        "website": "site",
-        "business_status": "status",
-        "subtypes": "subtypes",
-        "photo": "photo_url",
-        "description": "description",
-        "state_code": "state_code",
-    }
-    rename = {k: v for k, v in rename_map.items() if k in df.columns}
-    df = df.rename(columns=rename)
-
-    # Use subtypes (detailed) over category (single) when available
-    if "subtypes" in df.columns:
-        df["category"] = df["subtypes"]
-        df = df.drop(columns=["subtypes"])
-    # Use state_code (e.g. "DC") over state (e.g. "District Of Columbia")
-    if "state_code" in df.columns:
-        df["state"] = df["state_code"]
-        df = df.drop(columns=["state_code"])
+    # Drop fields a renamed API column replaces (e.g. category when subtypes exists)
+    superseded = [new for old, new in RENAME_MAP.items() if old in df.columns and new in df.columns]
+    df = df.drop(columns=superseded).rename(columns=RENAME_MAP)
 
     # Select only the columns we want (that exist)
-    keep_cols = [
-        "name", "full_address", "street", "city", "state", "zip_code",
-        "country_code", "phone", "site", "rating", "reviews", "category",
-        "working_hours", "latitude", "longitude", "place_id", "google_id",
-        "status", "photo_url", "description",
-    ]
-    existing = [c for c in keep_cols if c in df.columns]
-    df = df[existing]
-
-    return df
+    return df[[c for c in KEEP_COLS if c in df.columns]]
 
 
 def pull_from_config(
     client: ApiClient,
     limit: int,
     filter_location: str | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
 ) -> dict[str, pd.DataFrame]:
     """
     Run all queries from outscraper_queries.json config.
@@ -157,31 +279,31 @@ def pull_from_config(
             sys.exit(1)
 
     # Sort by priority
-    queries.sort(key=lambda q: q["priority"])
-
-    # Group by location to combine results per state/region
-    all_results: dict[str, list[dict]] = {}
+    # sorted() rather than .sort(): the config dict is cached and shared
+    queries = sorted(queries, key=lambda q: q["priority"])
 
     for q in queries:
-        search_term = q["search_term"]
-        location = q["location"]
-        key = slugify(location)
+        logger.info(f"[Priority {q['priority']}] \"{q['search_term']}\" in {q['location']}")
 
-        logger.info(f"[Priority {q['priority']}] \"{search_term}\" in {location}")
-        records = pull_google_maps(client, search_term, location, limit=limit)
+    # Submit every batch as an OutScraper job up front, then poll them concurrently
+    results = asyncio.run(pull_all(client, queries, limit, concurrency))
 
+    # One small frame per query, grouped by location to combine results per state/region
+    all_results: dict[str, list[pd.DataFrame]] = {}
+    for q, records in zip(queries, results):
+        key = slugify(q["location"])
         if key not in all_results:
             all_results[key] = []
-        all_results[key].extend(records)
+        all_results[key].append(records_to_dataframe(records))
+    # Frames hold their own copy of the data; drop the raw record dicts
+    del results
 
-        # Rate limit between queries — be generous to avoid API errors
-        time.sleep(5)
-
-    # Convert to DataFrames
+    # Stitch each location's frames together in one pass
     dataframes = {}
-    for key, records in all_results.items():
-        df = records_to_dataframe(records)
-        if not df.empty:
+    for key, frames in all_results.items():
+        frames = [f for f in frames if not f.empty]
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
             dataframes[key] = df
             logger.info(f"  {key}: {len(df)} total records")
 
@@ -212,10 +334,20 @@ def main():
         "--limit", type=int, default=100,
         help="Max results per query (default: 100)",
     )
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help=f"Max requests in flight with --from-config (default: {DEFAULT_CONCURRENCY})",
+    )
     parser.add_argument(
         "--output-dir",
         default=str(PROJECT_ROOT / "data" / "raw"),
-        help="Output directory for CSVs",
+        help="Output directory for raw files",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=["csv", "parquet"],
+        default="parquet",
+        help="Raw file format (default: parquet; clean_data.py reads both)",
     )
 
     args = parser.parse_args()
@@ -229,11 +361,16 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
 
     if args.from_config:
-        dataframes = pull_from_config(client, args.limit, args.filter_location)
-        for key, df in dataframes.items():
-            output_path = output_dir / f"outscraper_{key}.csv"
-            df.to_csv(output_path, index=False, encoding="utf-8")
-            logger.info(f"Saved {len(df)} records to {output_path}")
+        dataframes = pull_from_config(client, args.limit, args.filter_location, args.concurrency)
+        with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+            futures = {}
+            for key, df in dataframes.items():
+                output_path = output_dir / f"outscraper_{key}.{args.output_format}"
+                futures[executor.submit(write_table, df, output_path)] = (output_path, len(df))
+            for future in as_completed(futures):
+                future.result()
+                output_path, count = futures[future]
+                logger.info(f"Saved {count} records to {output_path}")
     else:
         records = pull_google_maps(client, args.query, args.location, args.limit)
         df = records_to_dataframe(records)
@@ -242,8 +379,8 @@ def main():
             sys.exit(1)
 
         slug = slugify(f"{args.query}_{args.location}")
-        output_path = output_dir / f"outscraper_{slug}.csv"
-        df.to_csv(output_path, index=False, encoding="utf-8")
+        output_path = output_dir / f"outscraper_{slug}.{args.output_format}"
+        write_table(df, output_path)
         logger.info(f"Saved {len(df)} records to {output_path}")
 
     logger.info("Done! Run scripts/clean_data.py next to process the raw data.")
@@ -13,59 +13,30 @@ Usage:
 import argparse
 import math
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date
 from pathlib import Path
 
 import pandas as pd
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from utils import setup_logging
+from utils import STRING_DTYPE, UNICODE_SPACES, GEODIR_COLUMN_MAP, setup_logging, read_table, write_table
 
 logger = setup_logging("prepare_import")
 
-# GeoDirectory CSV Import column mapping
-# Left = our column name, Right = GeoDirectory expected column name
-GEODIR_COLUMN_MAP = {
-    "therapist_name": "post_title",
-    "practice_name": "geodir_practice_name",
-    "address": "post_address",
-    "street": "street",
-    "city": "city",
-    "state": "region",
-    "zip_code": "zip",
-    "country_code": "country",
-    "phone": "geodir_contact_phone",
-    "email": "geodir_email",
-    "website": "geodir_website",
-    "latitude": "post_latitude",
-    "longitude": "post_longitude",
-    "license_type": "geodir_license_type",
-    "license_number": "geodir_license_number",
-    "license_state": "geodir_license_state",
-    "license_verified": "geodir_license_verified",
-    "specializations": "geodir_specializations",
-    "insurance_accepted": "geodir_insurance_accepted",
-    "sliding_scale": "geodir_sliding_scale",
-    "price_range_min": "geodir_price_range_min",
-    "price_range_max": "geodir_price_range_max",
-    "session_length": "geodir_session_length",
-    "telehealth": "geodir_telehealth",
-    "telehealth_platform": "geodir_telehealth_platform",
-    "accepting_new_patients": "geodir_accepting_new_patients",
-    "wait_time": "geodir_wait_time",
-    "languages": "geodir_languages",
-    "therapy_approaches": "geodir_therapy_approaches",
-    "age_groups_served": "geodir_age_groups_served",
-    "gender": "geodir_gender",
-    "years_experience": "geodir_years_experience",
-    "education": "geodir_education",
-    "profile_image_url": "geodir_profile_image_url",
-    "google_rating": "geodir_google_rating",
-    "google_review_count": "geodir_google_review_count",
-    "last_verified_date": "geodir_last_verified_date",
-    "data_source": "geodir_data_source",
-    "enrichment_status": "geodir_enrichment_status",
-}
+# --compression choice -> suffix appended to output filenames (write_table picks the codec)
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+# Batch files written in parallel (I/O-bound)
+WRITE_WORKERS = 4
+
+# Slug cleanup: drop anything but letters/digits/spaces/dashes, spaces become dashes
+SLUG_INVALID_CHARS = f"[^a-z0-9{UNICODE_SPACES}-]"
+SLUG_WHITESPACE = f"[{UNICODE_SPACES}]+"
+
+# Multiselect cleanup: commas with surrounding whitespace, and separators at either end
+MULTISELECT_COMMA = f"[{UNICODE_SPACES}]*,[{UNICODE_SPACES}]*"
+MULTISELECT_EDGES = f"^[{UNICODE_SPACES},]+|[{UNICODE_SPACES},]+$"
 
 # GeoDirectory required columns that need default values
 GEODIR_DEFAULTS = {
@@ -76,109 +47,104 @@ GEODIR_DEFAULTS = {
 }
 
 
-def generate_slug(name: str, city: str, state: str) -> str:
-    """Generate a URL slug like jane-doe-bethesda-md."""
-    import re
-    parts = []
-    for part in [name, city, state]:
-        if part and isinstance(part, str):
-            # Lowercase, remove special chars, replace spaces with hyphens
-            cleaned = re.sub(r"[^a-z0-9\s-]", "", part.lower().strip())
-            cleaned = re.sub(r"\s+", "-", cleaned)
-            cleaned = re.sub(r"-+", "-", cleaned).strip("-")
-            if cleaned:
-                parts.append(cleaned)
-    return "-".join(parts)
-
-
-def _safe_str(val) -> str:
-    """Convert a value to string, treating NaN/None as empty string."""
-    if pd.isna(val):
-        return ""
-    return str(val)
-
-
-def generate_description(row: pd.Series) -> str:
-    """Generate a post description/excerpt for the listing."""
-    parts = []
-
-    name = _safe_str(row.get("therapist_name", ""))
-    city = _safe_str(row.get("city", ""))
-    state = _safe_str(row.get("state", ""))
-    license_type = _safe_str(row.get("license_type", ""))
-    specializations = _safe_str(row.get("specializations", ""))
-    insurance = _safe_str(row.get("insurance_accepted", ""))
-    telehealth = _safe_str(row.get("telehealth", ""))
-
-    if name:
-        intro = name
-        if license_type:
-            intro += f" ({license_type})"
-        location = f"{city}, {state}" if city and state else city or state
-        if location:
-            intro += f" in {location}"
-        parts.append(intro + ".")
-
-    if specializations:
-        specs = specializations.split(", ")[:5]
-        parts.append(f"Specializes in {', '.join(specs)}.")
-
-    if insurance:
-        ins_list = insurance.split(", ")[:3]
-        remaining = len(insurance.split(", ")) - 3
-        ins_text = ", ".join(ins_list)
-        if remaining > 0:
-            ins_text += f" and {remaining} more"
-        parts.append(f"Accepts {ins_text}.")
-
-    if telehealth and telehealth not in ("No", "Unknown", ""):
-        parts.append("Telehealth available.")
-
-    accepting = _safe_str(row.get("accepting_new_patients", ""))
-    if accepting == "Yes":
-        parts.append("Currently accepting new patients.")
-
-    return " ".join(parts)
-
-
-def format_multiselect(value: str) -> str:
+def generate_slugs(df: pd.DataFrame) -> pd.Series:
+    """Generate URL slugs like jane-doe-bethesda-md for every row."""
+    name, city, state = (
+        df.get(col, pd.Series("", index=df.index, dtype=STRING_DTYPE)).fillna("")
+        for col in ["therapist_name", "city", "state"]
+    )
+    # Cleaning name, city and state separately and joining the non-empty ones
+    # gives the same slug as cleaning them space-joined in one pass
+    text = (name + " " + city + " " + state).str.lower()
+    return (
+        text.str.replace(SLUG_INVALID_CHARS, "", regex=True)
+        .str.replace(SLUG_WHITESPACE, "-", regex=True)
+        .str.replace(r"-+", "-", regex=True)
+        .str.strip("-")
+    )
+
+
+def generate_descriptions(df: pd.DataFrame) -> pd.Series:
+    """Generate a post description/excerpt for every listing."""
+    def column(name: str) -> pd.Series:
+        return df.get(name, pd.Series("", index=df.index, dtype=STRING_DTYPE)).fillna("")
+
+    name = column("therapist_name")
+    city = column("city")
+    state = column("state")
+    license_type = column("license_type")
+    specializations = column("specializations")
+    insurance = column("insurance_accepted")
+    telehealth = column("telehealth")
+    accepting = column("accepting_new_patients")
+
+    # Intro: "Name (LCSW) in City, ST."
+    location = (city + ", " + state).where((city != "") & (state != ""), city + state)
+    intro = (
+        name
+        + (" (" + license_type + ")").where(license_type != "", "")
+        + (" in " + location).where(location != "", "")
+        + "."
+    )
+
+    # Up to 5 specializations; up to 3 insurers plus a count of the rest
+    specs = specializations.str.split(", ").str[:5].str.join(", ")
+    ins_parts = insurance.str.split(", ")
+    remaining = ins_parts.str.len() - 3
+    ins_text = ins_parts.str[:3].str.join(", ") + (
+        " and " + remaining.astype(str) + " more"
+    ).where(remaining > 0, "")
+
+    # Each present sentence carries a trailing space; the last one is stripped below
+    parts = [
+        (intro + " ").where(name != "", ""),
+        ("Specializes in " + specs + ". ").where(specializations != "", ""),
+        ("Accepts " + ins_text + ". ").where(insurance != "", ""),
+        pd.Series("Telehealth available. ", index=df.index, dtype=STRING_DTYPE).where(
+            ~telehealth.isin(["No", "Unknown", ""]), ""
+        ),
+        pd.Series("Currently accepting new patients. ", index=df.index, dtype=STRING_DTYPE).where(
+            accepting == "Yes", ""
+        ),
+    ]
+    description = parts[0]
+    for part in parts[1:]:
+        description = description + part
+    return description.str.rstrip(" ")
+
+
+def format_multiselect(col: pd.Series) -> pd.Series:
     """
     Format comma-separated values for GeoDirectory multiselect fields.
     GeoDirectory expects comma-separated values.
+    Items are stripped and empty items dropped, then rejoined with ", ".
     """
-    if not value or not isinstance(value, str):
-        return ""
-    items = [item.strip() for item in value.split(",") if item.strip()]
-    return ", ".join(items)
+    return (
+        col.fillna("")
+        .str.replace(MULTISELECT_COMMA, ",", regex=True)
+        .str.replace(r",{2,}", ",", regex=True)
+        .str.replace(MULTISELECT_EDGES, "", regex=True)
+        .str.replace(",", ", ", regex=False)
+    )
 
 
 def prepare_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """Transform enriched data into GeoDirectory import format."""
-    out = pd.DataFrame()
-
-    # Map columns
-    for our_col, gd_col in GEODIR_COLUMN_MAP.items():
-        if our_col in df.columns:
-            out[gd_col] = df[our_col].fillna("")
-        else:
-            out[gd_col] = ""
+    # Map columns in one pass — source columns we don't have come back as ""
+    out = (
+        df.reindex(columns=list(GEODIR_COLUMN_MAP), fill_value="")
+        .fillna("")
+        .set_axis(list(GEODIR_COLUMN_MAP.values()), axis=1)
+    )
 
     # Add required defaults
-    for col, default in GEODIR_DEFAULTS.items():
-        out[col] = default
+    out = out.assign(**GEODIR_DEFAULTS)
 
     # Generate slugs for URLs
-    out["post_slug"] = df.apply(
-        lambda row: generate_slug(
-            row.get("therapist_name", ""),
-            row.get("city", ""),
-            row.get("state", ""),
-        ),
-        axis=1,
-    )
+    out["post_slug"] = generate_slugs(df)
 
     # Generate descriptions
-    out["post_content"] = df.apply(generate_description, axis=1)
+    out["post_content"] = generate_descriptions(df)
 
     # Set verification date to today for all imported records
     today = date.today().isoformat()
@@ -200,7 +166,7 @@ def prepare_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     ]
     for field in multiselect_fields:
         if field in out.columns:
-            out[field] = out[field].apply(format_multiselect)
+            out[field] = format_multiselect(out[field])
 
     # Ensure numeric fields
     for field in ["geodir_price_range_min", "geodir_price_range_max",
@@ -237,10 +203,14 @@ def print_import_summary(df: pd.DataFrame) -> None:
             if state:
                 logger.info(f"  {state}: {count}")
 
-    has_phone = (df["geodir_contact_phone"].fillna("").astype(bool)).sum()
-    has_website = (df["geodir_website"].fillna("").astype(bool)).sum()
-    has_insurance = (df["geodir_insurance_accepted"].fillna("").astype(bool)).sum()
-    has_specs = (df["geodir_specializations"].fillna("").astype(bool)).sum()
+    # Non-empty counts for all four fields in one pass
+    coverage_cols = [
+        "geodir_contact_phone", "geodir_website",
+        "geodir_insurance_accepted", "geodir_specializations",
+    ]
+    has_phone, has_website, has_insurance, has_specs = (
+        (df[coverage_cols].fillna("") != "").sum().tolist()
+    )
 
     logger.info(f"Has phone: {has_phone}")
     logger.info(f"Has website: {has_website}")
@@ -256,7 +226,7 @@ def main():
     parser.add_argument(
         "--input", "-i",
         required=True,
-        help="Path to enriched CSV from Phase 3",
+        help="Path to enriched CSV (or Parquet) from Phase 3",
     )
     parser.add_argument(
         "--output", "-o",
@@ -274,6 +244,12 @@ def main():
         default="therapists_geodirectory_import.csv",
         help="Base name for the output CSV file(s)",
     )
+    parser.add_argument(
+        "--compression",
+        choices=list(COMPRESSION_SUFFIXES),
+        default="none",
+        help="Compress output CSVs at level 1, only if your importer accepts compressed CSV (default: none)",
+    )
     args = parser.parse_args()
 
     # Load input
@@ -283,7 +259,7 @@ def main():
         sys.exit(1)
 
     logger.info(f"Loading enriched data from: {input_path}")
-    df = pd.read_csv(input_path, dtype=str)
+    df = read_table(input_path)
     logger.info(f"Loaded {len(df)} records")
 
     # Transform to GeoDirectory format
@@ -295,11 +271,12 @@ def main():
     # Write output
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
+    compression_suffix = COMPRESSION_SUFFIXES[args.compression]
 
     if len(gd_df) <= args.batch_size:
         # Single file
-        output_path = output_dir / args.output_filename
-        gd_df.to_csv(output_path, index=False, encoding="utf-8")
+        output_path = output_dir / f"{args.output_filename}{compression_suffix}"
+        write_table(gd_df, output_path)
         logger.info(f"Import file written to: {output_path}")
     else:
         # Split into batches
@@ -307,15 +284,19 @@ def main():
         base_name = Path(args.output_filename).stem
         ext = Path(args.output_filename).suffix
 
-        for i in range(num_batches):
-            start = i * args.batch_size
-            end = min(start + args.batch_size, len(gd_df))
-            batch_df = gd_df.iloc[start:end]
-
-            batch_filename = f"{base_name}_batch{i + 1}{ext}"
-            batch_path = output_dir / batch_filename
-            batch_df.to_csv(batch_path, index=False, encoding="utf-8")
-            logger.info(f"Batch {i + 1}/{num_batches}: {batch_path} ({len(batch_df)} records)")
+        with ThreadPoolExecutor(max_workers=min(WRITE_WORKERS, num_batches)) as executor:
+            futures = {}
+            # iloc slices are views, so batches share gd_df's memory until written
+            for i, start in enumerate(range(0, len(gd_df), args.batch_size)):
+                batch_df = gd_df.iloc[start:start + args.batch_size]
+
+                batch_filename = f"{base_name}_batch{i + 1}{ext}{compression_suffix}"
+                batch_path = output_dir / batch_filename
+                futures[executor.submit(write_table, batch_df, batch_path)] = (i, batch_path, len(batch_df))
+            for future in as_completed(futures):
+                future.result()
+                i, batch_path, count = futures[future]
+                logger.info(f"Batch {i + 1}/{num_batches}: {batch_path} ({count} records)")
 
     logger.info("Import files ready! Upload via GeoDirectory > Import/Export in WP Admin.")
     logger.info("Recommended: Import one batch at a time to avoid server timeouts.")
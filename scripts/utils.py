@@ -3,18 +3,109 @@ TherapistIndex — Shared Utilities
 Common functions used across the data pipeline scripts.
 """
 
+import csv
 import json
 import logging
 import os
 import re
+import string
 import sys
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+# Optional: pyahocorasick (pip install pyahocorasick) finds every alias of a
+# lookup in one pass over the text. Falls back to one substring check per alias.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # Project root is one level up from scripts/
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 CONFIG_DIR = PROJECT_ROOT / "config"
 DATA_DIR = PROJECT_ROOT / "data"
 
+# Arrow-backed strings with NaN for missing cells (the default ``str`` dtype in
+# pandas 3). Cells are stored as contiguous UTF-8 rather than boxed Python
+# objects, and .str methods run on Arrow compute kernels.
+STRING_DTYPE = pd.StringDtype("pyarrow", na_value=np.nan)
+
+# CSV writes go through a 1 MiB buffered handle, formatted 10k rows at a time
+CSV_WRITE_BUFFER = 1 << 20
+CSV_CHUNKSIZE = 10_000
+
+# Compressed CSVs (.csv.gz / .csv.zst) use level 1: far faster than the
+# defaults for a modest size cost. Arrow's zstd codec defaults to level 1.
+GZIP_COMPRESSION = {"method": "gzip", "compresslevel": 1}
+
+# File endings write_table knows how to write
+TABLE_SUFFIXES = (".csv", ".csv.gz", ".csv.zst", ".parquet")
+
+# Patterns used per row are compiled once at import
+NON_DIGIT = re.compile(r"\D")
+
+# str.translate table that deletes every ASCII character except 0-9
+ASCII_NON_DIGITS = str.maketrans("", "", "".join(chr(c) for c in range(128) if not chr(c).isdigit()))
+PRICE_PATTERN = re.compile(r"\$\s*(\d{2,4})\s*(?:[-–—to]+\s*\$?\s*(\d{2,4}))?")
+
+# Python's Unicode \s spelled out as a character-class body, so the pyarrow
+# string backend (RE2, ASCII-only \s) matches the same characters re does
+UNICODE_SPACES = "\\s\x0b\x1c-\x1f\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
+
+# State and direction abbreviations that title-casing mangles in addresses
+ADDRESS_UPPER_TOKENS = ["Dc", "Md", "Va", "Nw", "Ne", "Sw", "Se", "Usa", "Us"]
+ADDRESS_ABBREVIATIONS = re.compile(r"\b(?:" + "|".join(ADDRESS_UPPER_TOKENS) + r")\b")
+
+# GeoDirectory CSV Import column mapping
+# Left = our column name, Right = GeoDirectory expected column name
+GEODIR_COLUMN_MAP = {
+    "therapist_name": "post_title",
+    "practice_name": "geodir_practice_name",
+    "address": "post_address",
+    "street": "street",
+    "city": "city",
+    "state": "region",
+    "zip_code": "zip",
+    "country_code": "country",
+    "phone": "geodir_contact_phone",
+    "email": "geodir_email",
+    "website": "geodir_website",
+    "latitude": "post_latitude",
+    "longitude": "post_longitude",
+    "license_type": "geodir_license_type",
+    "license_number": "geodir_license_number",
+    "license_state": "geodir_license_state",
+    "license_verified": "geodir_license_verified",
+    "specializations": "geodir_specializations",
+    "insurance_accepted": "geodir_insurance_accepted",
+    "sliding_scale": "geodir_sliding_scale",
+    "price_range_min": "geodir_price_range_min",
+    "price_range_max": "geodir_price_range_max",
+    "session_length": "geodir_session_length",
+    "telehealth": "geodir_telehealth",
+    "telehealth_platform": "geodir_telehealth_platform",
+    "accepting_new_patients": "geodir_accepting_new_patients",
+    "wait_time": "geodir_wait_time",
+    "languages": "geodir_languages",
+    "therapy_approaches": "geodir_therapy_approaches",
+    "age_groups_served": "geodir_age_groups_served",
+    "gender": "geodir_gender",
+    "years_experience": "geodir_years_experience",
+    "education": "geodir_education",
+    "profile_image_url": "geodir_profile_image_url",
+    "google_rating": "geodir_google_rating",
+    "google_review_count": "geodir_google_review_count",
+    "last_verified_date": "geodir_last_verified_date",
+    "data_source": "geodir_data_source",
+    "enrichment_status": "geodir_enrichment_status",
+}
+
 
 def setup_logging(name: str, level=logging.INFO) -> logging.Logger:
     """Configure logging with consistent format across scripts."""
@@ -32,48 +123,154 @@ def setup_logging(name: str, level=logging.INFO) -> logging.Logger:
     return logger
 
 
+@lru_cache(maxsize=None)
 def load_config(filename: str) -> dict:
-    """Load a JSON config file from the config/ directory."""
+    """
+    Load a JSON config file from the config/ directory.
+    Parsed once per process and shared between callers — don't mutate the result.
+    """
     path = CONFIG_DIR / filename
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
+def read_csv_strings(path: Path, keep=None) -> pa.Table:
+    """
+    Read a CSV with Arrow's multi-threaded parser, keeping header columns that
+    pass keep(name) (all by default). Kept columns are declared as strings up
+    front from the header row: letting Arrow infer types would turn zip codes
+    like 07030 into the integer 7030.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f), [])
+    columns = [name for name in header if keep is None or keep(name)]
+    return pacsv.read_csv(
+        pa.memory_map(str(path)),
+        # Quoted cells (descriptions, addresses) may span lines
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=columns,
+            column_types={name: pa.string() for name in columns},
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def read_table(path: Path) -> pd.DataFrame:
+    """
+    Read a pipeline data file (.csv or .parquet) with every column as strings.
+    Missing values come back as NaN, same as pd.read_csv(dtype=str).
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path).astype(STRING_DTYPE)
+    return read_csv_strings(path).to_pandas(types_mapper={pa.string(): STRING_DTYPE}.get)
+
+
+def write_table(df: pd.DataFrame, path: Path) -> None:
+    """
+    Write a pipeline data file, choosing CSV, gzip/zstd CSV (.gz/.zst) or
+    zstd-compressed Parquet by suffix.
+    Object columns (mixed str/int/None) are stored as Arrow strings in Parquet.
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        object_cols = df.columns[df.dtypes == object]
+        df.astype({col: STRING_DTYPE for col in object_cols}).to_parquet(
+            path, index=False, compression="zstd"
+        )
+    elif path.suffix == ".gz":
+        df.to_csv(path, index=False, encoding="utf-8", chunksize=CSV_CHUNKSIZE, compression=GZIP_COMPRESSION)
+    elif path.suffix == ".zst":
+        # pyarrow's codec, so zstd doesn't need the zstandard package
+        with pa.CompressedOutputStream(str(path), "zstd") as f:
+            df.to_csv(f, index=False, encoding="utf-8", chunksize=CSV_CHUNKSIZE)
+    else:
+        with open(path, "w", buffering=CSV_WRITE_BUFFER, encoding="utf-8", newline="") as f:
+            df.to_csv(f, index=False, chunksize=CSV_CHUNKSIZE)
+
+
+def make_automaton(items):
+    """
+    Build an Aho-Corasick automaton from (word, payload) pairs.
+    Returns None when pyahocorasick isn't installed or there are no words.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word, payload in items:
+        automaton.add_word(word, payload)
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+class AliasLookup(dict):
+    """
+    Alias -> canonical name dict. With pyahocorasick installed, build_automaton()
+    compiles the aliases into an Aho-Corasick automaton for the match_* functions.
+    """
+
+    automaton = None
+
+    def build_automaton(self) -> None:
+        """(Re)build the automaton from the current aliases."""
+        self.automaton = make_automaton(
+            (alias, (len(alias), canonical)) for alias, canonical in self.items()
+        )
+
+
+@lru_cache(maxsize=None)
 def load_insurance_lookup() -> dict[str, str]:
-    """Build alias -> canonical name lookup from insurance_list.json."""
+    """
+    Build alias -> canonical name lookup from insurance_list.json.
+    Built once per process and shared between callers — don't mutate the result.
+    """
     config = load_config("insurance_list.json")
-    lookup = {}
+    lookup = AliasLookup()
     for provider in config["insurance_providers"]:
         canonical = provider["canonical_name"]
         for alias in provider["aliases"]:
             lookup[alias.lower().strip()] = canonical
+    lookup.build_automaton()
     return lookup
 
 
+@lru_cache(maxsize=None)
 def load_specialization_lookup() -> dict[str, str]:
-    """Build alias -> canonical name lookup from specializations.json."""
+    """
+    Build alias -> canonical name lookup from specializations.json.
+    Built once per process and shared between callers — don't mutate the result.
+    """
     config = load_config("specializations.json")
-    lookup = {}
+    lookup = AliasLookup()
     for spec in config["specializations"]:
         canonical = spec["canonical_name"]
         for alias in spec["aliases"]:
             lookup[alias.lower().strip()] = canonical
+    lookup.build_automaton()
     return lookup
 
 
+@lru_cache(maxsize=None)
 def load_approach_lookup() -> dict[str, str]:
-    """Build alias -> canonical name lookup for therapy approaches."""
+    """
+    Build alias -> canonical name lookup for therapy approaches.
+    Built once per process and shared between callers — don't mutate the result.
+    """
     config = load_config("specializations.json")
-    lookup = {}
+    lookup = AliasLookup()
     for approach in config["therapy_approaches"]:
         canonical = approach["canonical_name"]
         for alias in approach["aliases"]:
             lookup[alias.lower().strip()] = canonical
+    lookup.build_automaton()
     return lookup
 
 
 def load_filter_keywords() -> dict:
-    """Load filter keywords for excluding non-therapist results."""
+    """Load filter keywords for excluding non-therapist results (cached by load_config)."""
     return load_config("filter_keywords.json")
 
 
@@ -84,8 +281,11 @@ def standardize_phone(phone: str) -> str:
     """
     if not phone or not isinstance(phone, str):
         return ""
-    # Strip everything except digits
-    digits = re.sub(r"\D", "", phone)
+    # Strip everything except digits. translate handles ASCII; anything
+    # non-ASCII left over goes through re, which knows Unicode digits.
+    digits = phone.translate(ASCII_NON_DIGITS)
+    if not digits.isascii():
+        digits = NON_DIGIT.sub("", phone)
     # Handle country code prefix
     if len(digits) == 11 and digits.startswith("1"):
         digits = digits[1:]
@@ -94,6 +294,27 @@ def standardize_phone(phone: str) -> str:
     return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
 
 
+# Full state names (lowercase) -> two-letter abbreviations
+STATE_MAP = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR",
+    "california": "CA", "colorado": "CO", "connecticut": "CT",
+    "delaware": "DE", "district of columbia": "DC", "florida": "FL",
+    "georgia": "GA", "hawaii": "HI", "idaho": "ID", "illinois": "IL",
+    "indiana": "IN", "iowa": "IA", "kansas": "KS", "kentucky": "KY",
+    "louisiana": "LA", "maine": "ME", "maryland": "MD",
+    "massachusetts": "MA", "michigan": "MI", "minnesota": "MN",
+    "mississippi": "MS", "missouri": "MO", "montana": "MT",
+    "nebraska": "NE", "nevada": "NV", "new hampshire": "NH",
+    "new jersey": "NJ", "new mexico": "NM", "new york": "NY",
+    "north carolina": "NC", "north dakota": "ND", "ohio": "OH",
+    "oklahoma": "OK", "oregon": "OR", "pennsylvania": "PA",
+    "rhode island": "RI", "south carolina": "SC", "south dakota": "SD",
+    "tennessee": "TN", "texas": "TX", "utah": "UT", "vermont": "VT",
+    "virginia": "VA", "washington": "WA", "west virginia": "WV",
+    "wisconsin": "WI", "wyoming": "WY",
+}
+
+
 def standardize_state(state: str) -> str:
     """Convert state name to two-letter abbreviation."""
     if not state or not isinstance(state, str):
@@ -102,24 +323,6 @@ def standardize_state(state: str) -> str:
     # Already an abbreviation
     if len(state) == 2:
         return state.upper()
-    STATE_MAP = {
-        "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR",
-        "california": "CA", "colorado": "CO", "connecticut": "CT",
-        "delaware": "DE", "district of columbia": "DC", "florida": "FL",
-        "georgia": "GA", "hawaii": "HI", "idaho": "ID", "illinois": "IL",
-        "indiana": "IN", "iowa": "IA", "kansas": "KS", "kentucky": "KY",
-        "louisiana": "LA", "maine": "ME", "maryland": "MD",
-        "massachusetts": "MA", "michigan": "MI", "minnesota": "MN",
-        "mississippi": "MS", "missouri": "MO", "montana": "MT",
-        "nebraska": "NE", "nevada": "NV", "new hampshire": "NH",
-        "new jersey": "NJ", "new mexico": "NM", "new york": "NY",
-        "north carolina": "NC", "north dakota": "ND", "ohio": "OH",
-        "oklahoma": "OK", "oregon": "OR", "pennsylvania": "PA",
-        "rhode island": "RI", "south carolina": "SC", "south dakota": "SD",
-        "tennessee": "TN", "texas": "TX", "utah": "UT", "vermont": "VT",
-        "virginia": "VA", "washington": "WA", "west virginia": "WV",
-        "wisconsin": "WI", "wyoming": "WY",
-    }
     return STATE_MAP.get(state.lower(), state.upper()[:2])
 
 
@@ -138,28 +341,48 @@ def standardize_address(address: str) -> str:
     for part in parts:
         part = part.strip().title()
         # Fix state abbreviations that got title-cased
-        part = re.sub(r"\b(Dc)\b", "DC", part)
-        part = re.sub(r"\b(Md)\b", "MD", part)
-        part = re.sub(r"\b(Va)\b", "VA", part)
-        part = re.sub(r"\b(Nw)\b", "NW", part)
-        part = re.sub(r"\b(Nw|Ne|Sw|Se)\b", lambda m: m.group().upper(), part)
-        part = re.sub(r"\b(Usa?)\b", lambda m: m.group().upper(), part)
+        part = ADDRESS_ABBREVIATIONS.sub(lambda m: m.group().upper(), part)
         cleaned_parts.append(part)
     return ", ".join(cleaned_parts)
 
 
+# Characters allowed in a hostname label
+HOSTNAME_CHARS = frozenset(string.ascii_letters + string.digits + "-")
+
+
 def is_valid_url(url: str) -> bool:
     """Basic URL validation — checks structure, not reachability."""
     if not url or not isinstance(url, str):
         return False
     url = url.strip()
-    pattern = re.compile(
-        r"^https?://"
-        r"(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+"
-        r"[a-zA-Z]{2,}"
-        r"(?:/[^\s]*)?$"
+    if any(ch.isspace() for ch in url):
+        return False
+    try:
+        parts = urlsplit(url)
+        parts.port  # raises on a malformed port
+    except ValueError:
+        return False
+    if parts.scheme not in ("http", "https") or parts.username is not None or not parts.hostname:
+        return False
+    # Dotted hostname of ASCII labels ending in an alphabetic TLD
+    *labels, tld = parts.hostname.split(".")
+    return (
+        bool(labels)
+        and all(is_hostname_label(label) for label in labels)
+        and len(tld) >= 2
+        and tld.isascii()
+        and tld.isalpha()
+    )
+
+
+def is_hostname_label(label: str) -> bool:
+    """Whether label is 1-63 ASCII letters, digits or inner hyphens."""
+    return (
+        0 < len(label) <= 63
+        and set(label) <= HOSTNAME_CHARS
+        and not label.startswith("-")
+        and not label.endswith("-")
     )
-    return bool(pattern.match(url))
 
 
 def normalize_url(url: str) -> str:
@@ -174,42 +397,67 @@ def normalize_url(url: str) -> str:
     return url
 
 
+# License types in priority order with the keywords that identify them;
+# the first type with a keyword in the name/category wins
+LICENSE_TYPE_KEYWORDS = [
+    ("MD/Psychiatrist", ["psychiatr", ", md", "m.d."]),
+    ("PsyD", ["psyd", "psy.d"]),
+    ("PhD", ["ph.d", "phd", "psychologist"]),
+    ("LCSW", ["lcsw", "lcsw-c"]),
+    ("LCPC", ["lcpc"]),
+    ("LPC", ["lpc"]),
+    ("LCMFT", ["lcmft"]),
+    ("LMFT", ["lmft", "marriage and family"]),
+]
+
+# All license keywords in one alternation, with capture group i matching the
+# keywords of LICENSE_TYPE_KEYWORDS[i]
+LICENSE_TYPE_PATTERN = re.compile("|".join(
+    "(" + "|".join(re.escape(kw) for kw in keywords) + ")"
+    for _, keywords in LICENSE_TYPE_KEYWORDS
+))
+
+# Name fragments that mark a listing as a group practice
+GROUP_PRACTICE_INDICATORS = [
+    "group", "associates", "& associates", "center", "centre",
+    "clinic", "institute", "practice", "services", "wellness",
+    "counseling center", "therapy center", "behavioral health",
+    "mental health services", "psychological services",
+    "partners", "collective", "collaborative",
+]
+
+
 def guess_license_type(name: str, category: str = "") -> str:
     """
     Attempt to guess license type from business name/category.
     Returns one of: LCSW, LPC, LMFT, PsyD, PhD, MD/Psychiatrist, LCPC, LCMFT, or empty string.
     """
     text = f"{name} {category}".lower()
-    if "psychiatr" in text or ", md" in text or "m.d." in text:
-        return "MD/Psychiatrist"
-    if "psyd" in text or "psy.d" in text:
-        return "PsyD"
-    if "ph.d" in text or "phd" in text or "psychologist" in text:
-        return "PhD"
-    if "lcsw" in text or "lcsw-c" in text:
-        return "LCSW"
-    if "lcpc" in text:
-        return "LCPC"
-    if "lpc" in text:
-        return "LPC"
-    if "lcmft" in text:
-        return "LCMFT"
-    if "lmft" in text or "marriage and family" in text:
-        return "LMFT"
-    return ""
+    # The earliest match isn't necessarily the highest-priority one, so keep
+    # scanning unless the top type has already turned up
+    best = None
+    for m in LICENSE_TYPE_PATTERN.finditer(text):
+        rank = m.lastindex - 1
+        if best is None or rank < best:
+            best = rank
+            if best == 0:
+                break
+    return LICENSE_TYPE_KEYWORDS[best][0] if best is not None else ""
 
 
 def is_group_practice(name: str) -> bool:
     """Detect if a listing is a group practice vs solo practitioner."""
-    indicators = [
-        "group", "associates", "& associates", "center", "centre",
-        "clinic", "institute", "practice", "services", "wellness",
-        "counseling center", "therapy center", "behavioral health",
-        "mental health services", "psychological services",
-        "partners", "collective", "collaborative",
-    ]
     name_lower = name.lower() if name else ""
-    return any(ind in name_lower for ind in indicators)
+    return any(ind in name_lower for ind in GROUP_PRACTICE_INDICATORS)
+
+
+@lru_cache(maxsize=16)
+def lower_text(text: str) -> str:
+    """
+    text.lower(), memoized: the matchers and detectors all run on the same
+    page text, so it's lowercased once per page instead of once per call.
+    """
+    return text.lower()
 
 
 def match_insurance(text: str, lookup: dict[str, str]) -> list[str]:
@@ -219,7 +467,10 @@ def match_insurance(text: str, lookup: dict[str, str]) -> list[str]:
     """
     if not text:
         return []
-    text_lower = text.lower()
+    text_lower = lower_text(text)
+    automaton = getattr(lookup, "automaton", None)
+    if automaton is not None:
+        return sorted({canonical for _, (_, canonical) in automaton.iter(text_lower)})
     found = set()
     for alias, canonical in lookup.items():
         if alias in text_lower:
@@ -227,6 +478,19 @@ def match_insurance(text: str, lookup: dict[str, str]) -> list[str]:
     return sorted(found)
 
 
+@lru_cache(maxsize=None)
+def word_pattern(alias: str) -> re.Pattern:
+    """Compiled whole-word pattern for a short alias (cached per alias)."""
+    return re.compile(r"\b" + re.escape(alias) + r"\b")
+
+
+def is_word_boundary(text: str, i: int) -> bool:
+    """Whether position i of text is a word boundary, using the same word chars as re."""
+    before = i > 0 and (text[i - 1].isalnum() or text[i - 1] == "_")
+    after = i < len(text) and (text[i].isalnum() or text[i] == "_")
+    return before != after
+
+
 def match_specializations(text: str, lookup: dict[str, str]) -> list[str]:
     """
     Scan text for specialization mentions.
@@ -234,12 +498,23 @@ def match_specializations(text: str, lookup: dict[str, str]) -> list[str]:
     """
     if not text:
         return []
-    text_lower = text.lower()
+    text_lower = lower_text(text)
+    automaton = getattr(lookup, "automaton", None)
+    if automaton is not None:
+        found = set()
+        for end, (length, canonical) in automaton.iter(text_lower):
+            # Short aliases only count as whole words (see below)
+            if length > 3 or (
+                is_word_boundary(text_lower, end - length + 1)
+                and is_word_boundary(text_lower, end + 1)
+            ):
+                found.add(canonical)
+        return sorted(found)
     found = set()
     for alias, canonical in lookup.items():
         # Use word boundary matching for short aliases to avoid false positives
         if len(alias) <= 3:
-            if re.search(r"\b" + re.escape(alias) + r"\b", text_lower):
+            if word_pattern(alias).search(text_lower):
                 found.add(canonical)
         else:
             if alias in text_lower:
@@ -247,54 +522,62 @@ def match_specializations(text: str, lookup: dict[str, str]) -> list[str]:
     return sorted(found)
 
 
+# Phrases for detect_accepting_patients, checked in order: No, Waitlist, Yes
+ACCEPTING_NO_INDICATORS = [
+    "not accepting new",
+    "not currently accepting",
+    "no longer accepting",
+    "practice is full",
+    "caseload is full",
+    "currently full",
+]
+ACCEPTING_WAITLIST_INDICATORS = [
+    "waitlist",
+    "wait list",
+    "waiting list",
+    "join the waitlist",
+]
+ACCEPTING_YES_INDICATORS = [
+    "accepting new patients",
+    "accepting new clients",
+    "currently accepting",
+    "now accepting",
+    "welcoming new",
+    "taking new patients",
+    "taking new clients",
+    "open to new",
+    "availability for new",
+    "schedule an appointment",
+    "book an appointment",
+    "book a session",
+    "free consultation",
+    "complimentary consultation",
+]
+
+
 def detect_accepting_patients(text: str) -> str:
     """
     Scan text for indicators about accepting new patients.
     Returns: Yes, No, Waitlist, or Unknown.
     """
-    if not text:
-        return "Unknown"
-    text_lower = text.lower()
-    no_indicators = [
-        "not accepting new",
-        "not currently accepting",
-        "no longer accepting",
-        "practice is full",
-        "caseload is full",
-        "currently full",
-    ]
-    waitlist_indicators = [
-        "waitlist",
-        "wait list",
-        "waiting list",
-        "join the waitlist",
-    ]
-    yes_indicators = [
-        "accepting new patients",
-        "accepting new clients",
-        "currently accepting",
-        "now accepting",
-        "welcoming new",
-        "taking new patients",
-        "taking new clients",
-        "open to new",
-        "availability for new",
-        "schedule an appointment",
-        "book an appointment",
-        "book a session",
-        "free consultation",
-        "complimentary consultation",
-    ]
-    for phrase in no_indicators:
-        if phrase in text_lower:
-            return "No"
-    for phrase in waitlist_indicators:
-        if phrase in text_lower:
-            return "Waitlist"
-    for phrase in yes_indicators:
-        if phrase in text_lower:
-            return "Yes"
-    return "Unknown"
+    return analyze_bio(text)["accepting_new_patients"]
+
+
+# Phrases for detect_telehealth
+TELEHEALTH_VIDEO_INDICATORS = [
+    "telehealth", "teletherapy", "video session", "video therapy",
+    "online therapy", "online counseling", "virtual session",
+    "virtual therapy", "virtual appointment", "doxy", "zoom",
+    "simplepractice telehealth", "remote therapy",
+]
+TELEHEALTH_PHONE_INDICATORS = [
+    "phone session", "phone therapy", "telephone session",
+    "telephone therapy", "phone counseling",
+]
+TELEHEALTH_NO_INDICATORS = [
+    "in-person only", "in person only", "office visits only",
+    "no telehealth", "does not offer telehealth",
+]
 
 
 def detect_telehealth(text: str) -> str:
@@ -302,58 +585,24 @@ def detect_telehealth(text: str) -> str:
     Scan text for telehealth indicators.
     Returns: Yes - Video, Yes - Phone, Yes - Both, No, or Unknown.
     """
-    if not text:
-        return "Unknown"
-    text_lower = text.lower()
-    video_indicators = [
-        "telehealth", "teletherapy", "video session", "video therapy",
-        "online therapy", "online counseling", "virtual session",
-        "virtual therapy", "virtual appointment", "doxy", "zoom",
-        "simplepractice telehealth", "remote therapy",
-    ]
-    phone_indicators = [
-        "phone session", "phone therapy", "telephone session",
-        "telephone therapy", "phone counseling",
-    ]
-    no_indicators = [
-        "in-person only", "in person only", "office visits only",
-        "no telehealth", "does not offer telehealth",
-    ]
-    for phrase in no_indicators:
-        if phrase in text_lower:
-            return "No"
-    has_video = any(ind in text_lower for ind in video_indicators)
-    has_phone = any(ind in text_lower for ind in phone_indicators)
-    if has_video and has_phone:
-        return "Yes - Both"
-    if has_video:
-        return "Yes - Video"
-    if has_phone:
-        return "Yes - Phone"
-    return "Unknown"
+    return analyze_bio(text)["telehealth"]
+
+
+# Phrases for detect_sliding_scale
+SLIDING_SCALE_YES_INDICATORS = [
+    "sliding scale", "sliding fee", "income-based",
+    "reduced fee", "reduced rate", "financial hardship",
+    "ability to pay", "affordable rates",
+]
+SLIDING_SCALE_NO_INDICATORS = [
+    "no sliding scale", "does not offer sliding",
+    "do not offer sliding",
+]
 
 
 def detect_sliding_scale(text: str) -> str:
     """Detect if therapist offers sliding scale fees. Returns Yes, No, or Unknown."""
-    if not text:
-        return "Unknown"
-    text_lower = text.lower()
-    yes_indicators = [
-        "sliding scale", "sliding fee", "income-based",
-        "reduced fee", "reduced rate", "financial hardship",
-        "ability to pay", "affordable rates",
-    ]
-    no_indicators = [
-        "no sliding scale", "does not offer sliding",
-        "do not offer sliding",
-    ]
-    for phrase in no_indicators:
-        if phrase in text_lower:
-            return "No"
-    for phrase in yes_indicators:
-        if phrase in text_lower:
-            return "Yes"
-    return "Unknown"
+    return analyze_bio(text)["sliding_scale"]
 
 
 def extract_price_range(text: str) -> tuple[int | None, int | None]:
@@ -364,40 +613,117 @@ def extract_price_range(text: str) -> tuple[int | None, int | None]:
     if not text:
         return None, None
     # Match patterns like "$150", "$100-$200", "$100 - $200", "$100 to $200"
-    pattern = r"\$\s*(\d{2,4})\s*(?:[-–—to]+\s*\$?\s*(\d{2,4}))?"
-    matches = re.findall(pattern, text)
-    if not matches:
-        return None, None
-    prices = []
-    for match in matches:
-        prices.append(int(match[0]))
-        if match[1]:
-            prices.append(int(match[1]))
-    # Filter out unreasonable prices (therapy typically $50-$500/session)
-    valid = [p for p in prices if 20 <= p <= 600]
-    if not valid:
-        return None, None
-    return min(valid), max(valid)
+    # Track the min/max in one pass, skipping unreasonable prices
+    # (therapy typically $50-$500/session)
+    low = high = None
+    for match in PRICE_PATTERN.finditer(text):
+        for price in match.groups():
+            if price is None:
+                continue
+            price = int(price)
+            if not 20 <= price <= 600:
+                continue
+            if low is None or price < low:
+                low = price
+            if high is None or price > high:
+                high = price
+    return low, high
+
+
+# Telehealth platform -> keywords that mention it
+TELEHEALTH_PLATFORMS = {
+    "doxy.me": ["doxy", "doxy.me"],
+    "Zoom": ["zoom"],
+    "SimplePractice": ["simplepractice", "simple practice"],
+    "TherapyNotes": ["therapynotes", "therapy notes"],
+    "VSee": ["vsee"],
+    "Google Meet": ["google meet"],
+    "Microsoft Teams": ["microsoft teams", "ms teams"],
+    "TheraNest": ["theranest"],
+    "Jane App": ["jane app", "janeapp"],
+}
 
 
 def detect_telehealth_platform(text: str) -> str:
     """Detect which telehealth platform is mentioned in text."""
-    if not text:
-        return ""
-    text_lower = text.lower()
-    platforms = {
-        "doxy.me": ["doxy", "doxy.me"],
-        "Zoom": ["zoom"],
-        "SimplePractice": ["simplepractice", "simple practice"],
-        "TherapyNotes": ["therapynotes", "therapy notes"],
-        "VSee": ["vsee"],
-        "Google Meet": ["google meet"],
-        "Microsoft Teams": ["microsoft teams", "ms teams"],
-        "TheraNest": ["theranest"],
-        "Jane App": ["jane app", "janeapp"],
+    return analyze_bio(text)["telehealth_platform"]
+
+
+def detector_signals() -> dict[str, frozenset]:
+    """Map every detector phrase to the (detector, signal) pairs it indicates."""
+    groups = [
+        (("accepting", "No"), ACCEPTING_NO_INDICATORS),
+        (("accepting", "Waitlist"), ACCEPTING_WAITLIST_INDICATORS),
+        (("accepting", "Yes"), ACCEPTING_YES_INDICATORS),
+        (("telehealth", "No"), TELEHEALTH_NO_INDICATORS),
+        (("telehealth", "Video"), TELEHEALTH_VIDEO_INDICATORS),
+        (("telehealth", "Phone"), TELEHEALTH_PHONE_INDICATORS),
+        (("sliding_scale", "No"), SLIDING_SCALE_NO_INDICATORS),
+        (("sliding_scale", "Yes"), SLIDING_SCALE_YES_INDICATORS),
+    ]
+    groups += [(("platform", platform), keywords) for platform, keywords in TELEHEALTH_PLATFORMS.items()]
+    signals = {}
+    for signal, phrases in groups:
+        for phrase in phrases:
+            signals.setdefault(phrase, set()).add(signal)
+    return {phrase: frozenset(found) for phrase, found in signals.items()}
+
+
+# All detector phrases in one table (and automaton, with pyahocorasick) so
+# analyze_bio collects every detector's signals in a single scan
+DETECTOR_SIGNALS = detector_signals()
+DETECTOR_AUTOMATON = make_automaton(DETECTOR_SIGNALS.items())
+
+
+def analyze_bio(text: str) -> dict[str, str]:
+    """
+    Run the accepting-patients, telehealth, sliding-scale and platform
+    detectors over text in one pass. Returns their results keyed by
+    accepting_new_patients, telehealth, sliding_scale and telehealth_platform.
+    """
+    signals = set()
+    if text:
+        text_lower = lower_text(text)
+        if DETECTOR_AUTOMATON is not None:
+            for _, phrase_signals in DETECTOR_AUTOMATON.iter(text_lower):
+                signals |= phrase_signals
+        else:
+            for phrase, phrase_signals in DETECTOR_SIGNALS.items():
+                if phrase in text_lower:
+                    signals |= phrase_signals
+
+    # No beats Waitlist beats Yes
+    accepting = "Unknown"
+    for answer in ("No", "Waitlist", "Yes"):
+        if ("accepting", answer) in signals:
+            accepting = answer
+            break
+
+    has_video = ("telehealth", "Video") in signals
+    has_phone = ("telehealth", "Phone") in signals
+    if ("telehealth", "No") in signals:
+        telehealth = "No"
+    elif has_video and has_phone:
+        telehealth = "Yes - Both"
+    elif has_video:
+        telehealth = "Yes - Video"
+    elif has_phone:
+        telehealth = "Yes - Phone"
+    else:
+        telehealth = "Unknown"
+
+    if ("sliding_scale", "No") in signals:
+        sliding_scale = "No"
+    elif ("sliding_scale", "Yes") in signals:
+        sliding_scale = "Yes"
+    else:
+        sliding_scale = "Unknown"
+
+    platforms = [p for p in TELEHEALTH_PLATFORMS if ("platform", p) in signals]
+
+    return {
+        "accepting_new_patients": accepting,
+        "telehealth": telehealth,
+        "sliding_scale": sliding_scale,
+        "telehealth_platform": ", ".join(platforms),
     }
-    found = []
-    for platform, keywords in platforms.items():
-        if any(kw in text_lower for kw in keywords):
-            found.append(platform)
-    return ", ".join(found) if found else ""
@@ -16,32 +16,97 @@ import argparse
 import re
 import sys
 import time
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Optional: selectolax (pip install selectolax) pulls the text out of result
+# pages with the Lexbor C parser. Falls back to BeautifulSoup's html.parser.
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+    from bs4 import BeautifulSoup
+
+# Optional: requests-cache (pip install requests-cache) keeps board responses in
+# a local SQLite cache so re-runs don't query the boards again.
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
 
 sys.path.insert(0, str(Path(__file__).resolve().parent))
-from utils import setup_logging
+from utils import DATA_DIR, setup_logging, read_table, write_table
 
 logger = setup_logging("verify_licenses")
 
 # Rate limiting defaults
 REQUEST_DELAY = 2.0  # seconds between requests to each board
 REQUEST_TIMEOUT = 15.0  # seconds
+HTTP_POOL_SIZE = 4  # keep-alive connections per board
+
+# Successful board responses are reused for a week (one SQLite file per board)
+CACHE_DIR = DATA_DIR / "cache"
+CACHE_EXPIRY = timedelta(days=7)
+
+# Transient board errors are retried with exponential backoff (0.5s, 1s, 2s).
+# The final response is returned either way so its status lands in the notes.
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET",),
+    raise_on_status=False,
+)
+
+# Credentials/titles and business suffixes stripped from names before lookup
+NAME_NOISE_PATTERN = re.compile(
+    r",?\s*(?:LCSW|LPC|LMFT|PsyD|PhD|MD|LCPC|LCMFT|MA|MS|MSW|MEd|EdD|NCC|ACS|LICSW)[-\w]*"
+    r"|\b(?:LLC|Inc|PLLC|PC|Associates|& Associates|Group|Center|Practice)\b",
+    re.IGNORECASE,
+)
+DR_PREFIX_PATTERN = re.compile(r"^Dr\.?\s+", re.IGNORECASE)
+
+
+def page_text(html: str) -> str:
+    """Lowercased text content of an HTML page (script/style excluded)."""
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        tree.strip_tags(["script", "style"])
+        return tree.text().lower()
+    return BeautifulSoup(html, "html.parser").get_text().lower()
 
 
 class LicenseVerifier:
     """Base class for state license verification."""
 
-    def __init__(self, state: str, delay: float = REQUEST_DELAY):
+    def __init__(self, state: str, delay: float = REQUEST_DELAY, cache: bool = True):
         self.state = state
         self.delay = delay
-        self.session = requests.Session()
+        self._next_request_at = 0.0
+        if cache and requests_cache is not None:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            self.session = requests_cache.CachedSession(
+                str(CACHE_DIR / f"verify_{state.lower()}"),
+                expire_after=CACHE_EXPIRY,
+            )
+        else:
+            self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "TherapistIndex Directory Verification Bot/1.0"
         })
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=HTTP_RETRY,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def verify(self, name: str, license_type: str = "") -> dict:
         """
@@ -50,22 +115,29 @@ class LicenseVerifier:
         """
         raise NotImplementedError
 
+    def _get(self, url: str, params: dict) -> requests.Response:
+        """
+        GET from the board, starting live requests at least self.delay apart.
+        Spacing is start to start, so time spent waiting on the board counts
+        toward the delay. Responses served from the cache don't count at all.
+        """
+        wait = self._next_request_at - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        started = time.monotonic()
+        self._next_request_at = started + self.delay
+        resp = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
+        if getattr(resp, "from_cache", False):
+            self._next_request_at = started
+        return resp
+
     def _extract_name_parts(self, name: str) -> tuple[str, str]:
         """Split a name into (first, last), handling common patterns."""
         if not name:
             return "", ""
-        # Remove credentials/titles
-        name = re.sub(
-            r",?\s*(LCSW|LPC|LMFT|PsyD|PhD|MD|LCPC|LCMFT|MA|MS|MSW|MEd|EdD|NCC|ACS|LICSW)[-\w]*",
-            "", name, flags=re.IGNORECASE
-        ).strip()
-        # Remove business suffixes
-        name = re.sub(
-            r"\b(LLC|Inc|PLLC|PC|Associates|& Associates|Group|Center|Practice)\b",
-            "", name, flags=re.IGNORECASE
-        ).strip()
-        # Remove Dr. prefix
-        name = re.sub(r"^Dr\.?\s+", "", name, flags=re.IGNORECASE)
+        # Remove credentials/titles and business suffixes, then the Dr. prefix
+        name = NAME_NOISE_PATTERN.sub("", name).strip()
+        name = DR_PREFIX_PATTERN.sub("", name)
 
         parts = name.split()
         if len(parts) >= 2:
@@ -83,8 +155,8 @@ class DCVerifier(LicenseVerifier):
 
     BASE_URL = "https://doh.dc.gov/service/license-verification"
 
-    def __init__(self, delay: float = REQUEST_DELAY):
-        super().__init__("DC", delay)
+    def __init__(self, delay: float = REQUEST_DELAY, cache: bool = True):
+        super().__init__("DC", delay, cache)
 
     def verify(self, name: str, license_type: str = "") -> dict:
         result = {
@@ -109,17 +181,11 @@ class DCVerifier(LicenseVerifier):
                 "last_name": last_name,
                 "first_name": first_name,
             }
-            resp = self.session.get(
-                self.BASE_URL,
-                params=params,
-                timeout=REQUEST_TIMEOUT,
-            )
-            time.sleep(self.delay)
+            resp = self._get(self.BASE_URL, params)
 
             if resp.status_code == 200:
-                soup = BeautifulSoup(resp.text, "html.parser")
                 # Look for results containing the therapist name
-                text = soup.get_text().lower()
+                text = page_text(resp.text)
                 if last_name.lower() in text:
                     # Found a potential match — flag for manual review
                     result["verification_notes"] = "Name found in DC DOH database — needs manual confirmation"
@@ -142,8 +208,8 @@ class MDVerifier(LicenseVerifier):
 
     BASE_URL = "https://health.maryland.gov/bopc"
 
-    def __init__(self, delay: float = REQUEST_DELAY):
-        super().__init__("MD", delay)
+    def __init__(self, delay: float = REQUEST_DELAY, cache: bool = True):
+        super().__init__("MD", delay, cache)
 
     def verify(self, name: str, license_type: str = "") -> dict:
         result = {
@@ -167,16 +233,10 @@ class MDVerifier(LicenseVerifier):
                 "lastName": last_name,
                 "firstName": first_name,
             }
-            resp = self.session.get(
-                self.BASE_URL,
-                params=params,
-                timeout=REQUEST_TIMEOUT,
-            )
-            time.sleep(self.delay)
+            resp = self._get(self.BASE_URL, params)
 
             if resp.status_code == 200:
-                soup = BeautifulSoup(resp.text, "html.parser")
-                text = soup.get_text().lower()
+                text = page_text(resp.text)
                 if last_name.lower() in text:
                     result["verification_notes"] = "Name found in MD BOPC database — needs manual confirmation"
                 else:
@@ -199,8 +259,8 @@ class VAVerifier(LicenseVerifier):
     BASE_URL = "https://dhp.virginia.gov/counseling"
     LOOKUP_URL = "https://dhp.virginia.gov/lookup/default"
 
-    def __init__(self, delay: float = REQUEST_DELAY):
-        super().__init__("VA", delay)
+    def __init__(self, delay: float = REQUEST_DELAY, cache: bool = True):
+        super().__init__("VA", delay, cache)
 
     def verify(self, name: str, license_type: str = "") -> dict:
         result = {
@@ -223,16 +283,10 @@ class VAVerifier(LicenseVerifier):
                 "firstName": first_name,
                 "profession": "counseling",
             }
-            resp = self.session.get(
-                self.LOOKUP_URL,
-                params=params,
-                timeout=REQUEST_TIMEOUT,
-            )
-            time.sleep(self.delay)
+            resp = self._get(self.LOOKUP_URL, params)
 
             if resp.status_code == 200:
-                soup = BeautifulSoup(resp.text, "html.parser")
-                text = soup.get_text().lower()
+                text = page_text(resp.text)
                 if last_name.lower() in text:
                     result["verification_notes"] = "Name found in VA DHP database — needs manual confirmation"
                 else:
@@ -246,7 +300,7 @@ class VAVerifier(LicenseVerifier):
         return result
 
 
-def get_verifier(state: str) -> LicenseVerifier | None:
+def get_verifier(state: str, cache: bool = True) -> LicenseVerifier | None:
     """Get the appropriate verifier for a state."""
     verifiers = {
         "DC": DCVerifier,
@@ -254,7 +308,7 @@ def get_verifier(state: str) -> LicenseVerifier | None:
         "VA": VAVerifier,
     }
     cls = verifiers.get(state.upper())
-    return cls() if cls else None
+    return cls(cache=cache) if cls else None
 
 
 def print_verification_summary(df: pd.DataFrame) -> None:
@@ -287,7 +341,7 @@ def main():
     parser.add_argument(
         "--input", "-i",
         required=True,
-        help="Path to enriched CSV",
+        help="Path to enriched CSV (or Parquet)",
     )
     parser.add_argument(
         "--output", "-o",
@@ -312,10 +366,15 @@ def main():
         default=REQUEST_DELAY,
         help=f"Delay between requests in seconds (default: {REQUEST_DELAY})",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Always query the boards, ignoring cached responses in {CACHE_DIR}",
+    )
     parser.add_argument(
         "--output-filename",
         default="therapists_verified.csv",
-        help="Name of the output CSV file",
+        help="Name of the output file (.csv, .csv.gz, .csv.zst or .parquet)",
     )
     args = parser.parse_args()
 
@@ -326,7 +385,7 @@ def main():
         sys.exit(1)
 
     logger.info(f"Loading data from: {input_path}")
-    df = pd.read_csv(input_path, dtype=str)
+    df = read_table(input_path)
     logger.info(f"Loaded {len(df)} records")
 
     # Filter by state if specified
@@ -350,35 +409,71 @@ def main():
     states_to_verify = ["DC", "MD", "VA"] if args.state == "ALL" else [args.state]
     verifiers = {}
     for state in states_to_verify:
-        v = get_verifier(state)
+        v = get_verifier(state, cache=not args.no_cache)
         if v:
             verifiers[state] = v
 
-    processed = 0
-    for idx, row in df_to_verify.iterrows():
-        state = str(row.get("state", "")).upper()
-        if state not in verifiers:
-            df_to_verify.at[idx, "verification_notes"] = f"No verifier available for state: {state}"
-            continue
-
-        name = row.get("therapist_name", "")
-        license_type = row.get("license_type", "")
-
-        if not name:
-            continue
-
-        processed += 1
-        if processed % 10 == 0:
-            logger.info(f"Progress: {processed}/{len(df_to_verify)}")
-
-        result = verifiers[state].verify(name, license_type)
-
-        df_to_verify.at[idx, "license_verified"] = str(result["verified"])
-        if result["license_number"]:
-            df_to_verify.at[idx, "license_number"] = result["license_number"]
-        if result["license_type"]:
-            df_to_verify.at[idx, "license_type"] = result["license_type"]
-        df_to_verify.at[idx, "verification_notes"] = result.get("verification_notes", "")
+    # Rows without a verifier for their state are noted in one column-wide pass
+    states = df_to_verify.get("state", pd.Series("", index=df_to_verify.index)).fillna("").astype(str).str.upper()
+    no_verifier = ~states.isin(list(verifiers))
+    df_to_verify.loc[no_verifier, "verification_notes"] = "No verifier available for state: " + states[no_verifier]
+
+    # Results are collected in plain lists (by row position) and assigned
+    # back as whole columns once every lookup is done
+    empty = pd.Series("", index=df_to_verify.index)
+    names = df_to_verify.get("therapist_name", empty).fillna("").tolist()
+    lookup_types = df_to_verify.get("license_type", empty).fillna("").tolist()
+    license_types = df_to_verify.get("license_type", empty).tolist()
+    verified_list = df_to_verify["license_verified"].tolist()
+    number_list = df_to_verify["license_number"].tolist()
+    notes_list = df_to_verify["verification_notes"].tolist()
+
+    # One single-worker pool per board: each board still gets one request at a
+    # time with its delay in between, while the boards are queried in parallel
+    pools = {state: ThreadPoolExecutor(max_workers=1) for state in verifiers}
+    try:
+        # A lookup depends only on the board and the parsed first/last name
+        # (plus license type), so practitioners listed at several offices
+        # are looked up once and the result shared by all their rows
+        rows_by_key = {}
+        futures = {}
+        for i, (state, name, license_type) in enumerate(zip(states.tolist(), names, lookup_types)):
+            if state not in verifiers or not name:
+                continue
+            key = (state, *verifiers[state]._extract_name_parts(name), license_type)
+            if key not in rows_by_key:
+                rows_by_key[key] = []
+                future = pools[state].submit(verifiers[state].verify, name, license_type)
+                futures[future] = key
+            rows_by_key[key].append(i)
+
+        num_rows = sum(len(rows) for rows in rows_by_key.values())
+        logger.info(f"Verifying {num_rows} records with {len(futures)} unique lookups")
+
+        processed = 0
+        for future in as_completed(futures):
+            result = future.result()
+
+            processed += 1
+            if processed % 10 == 0:
+                logger.info(f"Progress: {processed}/{len(futures)}")
+
+            for i in rows_by_key[futures[future]]:
+                verified_list[i] = str(result["verified"])
+                if result["license_number"]:
+                    number_list[i] = result["license_number"]
+                if result["license_type"]:
+                    license_types[i] = result["license_type"]
+                notes_list[i] = result.get("verification_notes", "")
+    finally:
+        for pool in pools.values():
+            pool.shutdown(cancel_futures=True)
+
+    df_to_verify["license_verified"] = verified_list
+    df_to_verify["license_number"] = number_list
+    df_to_verify["verification_notes"] = notes_list
+    if "license_type" in df_to_verify.columns:
+        df_to_verify["license_type"] = license_types
 
     # Merge verification results back into full dataframe
     if args.state != "ALL":
@@ -398,7 +493,7 @@ def main():
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
     output_path = output_dir / args.output_filename
-    output_df.to_csv(output_path, index=False, encoding="utf-8")
+    write_table(output_df, output_path)
     logger.info(f"Verification results written to: {output_path}")
 
 